@@ -1,43 +1,292 @@
+import asyncio
+import csv
 import json
+import logging
 import os
-from collections import namedtuple
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import cache, lru_cache
 
-from anthropic import Anthropic
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from anthropic import Anthropic, AsyncAnthropic, DefaultAioHttpClient, Timeout
+from anthropic.types import Message
+from anthropic.types.messages.batch_create_params import Request
 from dotenv import load_dotenv
 
+from happytube.claude_cache import CacheBackend, cache_key
 from happytube.prompts import get_prompt
 
-ClaudeConfig = namedtuple("ClaudeConfig", ["claude_model_version", "claude_max_tokens"])
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
 
+logger = logging.getLogger(__name__)
 
-def default_settings():
-    claude_config = ClaudeConfig(
-        claude_model_version="claude-3-opus-20240229", claude_max_tokens=4096
-    )
+DEFAULT_MODEL = "claude-haiku-4-5"
 
-    return claude_config
+# Opus is still available as an explicit override
+model_for_prompt = {
+    "rate_video_happiness": "claude-haiku-4-5",
+    # stripping spam from a description does not need a bigger model
+    "make_description_meaningful": "claude-haiku-4-5",
+}
 
+BATCH_POLL_INTERVAL = 10
+# batches that have not ended by then are canceled (the API's own limit is 24h)
+BATCH_TIMEOUT = 6 * 3600
 
-def create_client() -> Anthropic:
+
+@dataclass(slots=True, frozen=True)
+class ClaudeConfig:
+    claude_model_version: str = DEFAULT_MODEL
+    claude_max_tokens: int = 4096
+
+
+_DEFAULT_CONFIG = ClaudeConfig()
+_PROMPT_CONFIGS = {
+    name: ClaudeConfig(claude_model_version=model)
+    for name, model in model_for_prompt.items()
+}
+
+
+def default_settings(prompt_name: str | None = None) -> ClaudeConfig:
+    return _PROMPT_CONFIGS.get(prompt_name, _DEFAULT_CONFIG)
+
+
+def prompt_block(prompt: str, cache_ttl: str | None = None) -> dict:
+    """Build the static prompt content block, marked for prompt caching.
+
+    The prompt has to come before any per-call content so the cached prefix
+    stays contiguous. Pass cache_ttl="1h" for the longer-lived cache.
+    """
+    cache_control = {"type": "ephemeral"}
+    if cache_ttl:
+        cache_control["ttl"] = cache_ttl
+    return {"type": "text", "text": prompt, "cache_control": cache_control}
+
+
+@cache
+def load_env() -> None:
+    """Load .env into the environment, once per process.
+
+    load_dotenv() searches the directory tree for the file on every call.
+    """
     _ = load_dotenv()
+
+
+def api_key() -> str:
+    """Return ANTHROPIC_API_KEY from the environment or .env.
+
+    The clients accept a missing key and only fail on each request, which
+    callers that fall back on errors would hide, so fail here instead.
+
+    Raises:
+        RuntimeError: If the key is not set
+    """
+    load_env()
+    key = os.environ.get("ANTHROPIC_API_KEY")
+    if not key:
+        raise RuntimeError("ANTHROPIC_API_KEY is not set (environment or .env)")
+    return key
+
+
+@lru_cache(maxsize=1)
+def get_client() -> Anthropic:
+    """Get the process-wide Anthropic client.
+
+    Sharing one client keeps its connection pool (and TLS sessions) warm
+    across stages; the SDK's default pool limits are already generous.
+    """
     client = Anthropic(
-        api_key=os.environ.get("ANTHROPIC_API_KEY"),
+        api_key=api_key(),
+        max_retries=5,
+        timeout=Timeout(60.0, connect=5.0),
+    )
+    return client
+
+
+def create_client() -> Anthropic:
+    """Return the shared client; kept for the scripts that call it in loops."""
+    return get_client()
+
+
+def create_async_client() -> AsyncAnthropic:
+    """Create an aiohttp-backed async client for concurrent requests.
+
+    The SDK retries rate-limited (429) and overloaded responses with
+    exponential backoff; fanning out requests makes those more likely, so
+    it gets the same retry budget as the shared sync client.
+    """
+    client = AsyncAnthropic(
+        api_key=api_key(),
+        max_retries=5,
+        timeout=Timeout(60.0, connect=5.0),
+        http_client=DefaultAioHttpClient(),
     )
     return client
 
 
+def is_cacheable(response: Message) -> bool:
+    """Only complete answers are cached; a truncated one would be replayed."""
+    return response.stop_reason == "end_turn"
+
+
 def get_response(
-    client: Anthropic, message: dict, settings: ClaudeConfig | None = None
-) -> str:
+    client: Anthropic,
+    message: dict,
+    settings: ClaudeConfig | None = None,
+    cache: CacheBackend | None = None,
+    key: str | None = None,
+) -> Message:
     settings = settings or default_settings()
+    cached = cache.get(key) if cache is not None and key is not None else None
+    if cached is not None:
+        return Message.model_validate_json(cached)
     response = client.messages.create(
         model=settings.claude_model_version,
         messages=[message],
         max_tokens=settings.claude_max_tokens,
     )
+    if cache is not None and key is not None and is_cacheable(response):
+        cache.set(key, response.model_dump_json())
     return response
 
 
+async def aget_response(
+    client: AsyncAnthropic,
+    message: dict,
+    settings: ClaudeConfig | None = None,
+    cache: CacheBackend | None = None,
+    key: str | None = None,
+) -> Message:
+    settings = settings or default_settings()
+    cached = cache.get(key) if cache is not None and key is not None else None
+    if cached is not None:
+        return Message.model_validate_json(cached)
+    response = await client.messages.create(
+        model=settings.claude_model_version,
+        messages=[message],
+        max_tokens=settings.claude_max_tokens,
+    )
+    if cache is not None and key is not None and is_cacheable(response):
+        cache.set(key, response.model_dump_json())
+    return response
+
+
+async def run_batch(
+    client: AsyncAnthropic,
+    requests: list[Request],
+    poll_interval: float = BATCH_POLL_INTERVAL,
+    timeout: float = BATCH_TIMEOUT,
+) -> dict[str, Message]:
+    """Submit requests as one Message Batch and wait for it to end.
+
+    Args:
+        client: Async Anthropic client
+        requests: Batch requests, each with a unique custom_id
+        poll_interval: Seconds between batch status checks
+        timeout: Seconds to wait before the batch is canceled
+
+    Returns:
+        Mapping of custom_id to the response of every succeeded request
+
+    Raises:
+        TimeoutError: If the batch has not ended within timeout
+    """
+    batch = await client.messages.batches.create(requests=requests)
+    deadline = time.monotonic() + timeout
+    while batch.processing_status != "ended":
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            await client.messages.batches.cancel(batch.id)
+            raise TimeoutError(f"Message Batch {batch.id} did not end in {timeout}s")
+        await asyncio.sleep(min(poll_interval, remaining))
+        batch = await client.messages.batches.retrieve(batch.id)
+
+    results = {}
+    async for entry in await client.messages.batches.results(batch.id):
+        if entry.result.type == "succeeded" and entry.result.message.content:
+            results[entry.custom_id] = entry.result.message
+    return results
+
+
+def stream_response_lines(
+    client: Anthropic, message: dict, settings: ClaudeConfig | None = None
+) -> Iterator[str]:
+    """Stream Claude's answer, yielding each line as soon as it is complete."""
+    settings = settings or default_settings()
+    pending = ""
+    with client.messages.stream(
+        model=settings.claude_model_version,
+        messages=[message],
+        max_tokens=settings.claude_max_tokens,
+    ) as stream:
+        for text in stream.text_stream:
+            pending += text
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+    if pending:
+        yield pending
+
+
+def dedupe_videos(videos: list[dict]) -> list[dict]:
+    """Drop repeated video_ids and sort by video_id.
+
+    Overlapping searches can return the same video twice; a stable order also
+    keeps the request (and its cache key) the same across runs.
+    """
+    deduped = {}
+    for video in videos:
+        deduped.setdefault(video.get("video_id"), video)
+    return sorted(deduped.values(), key=lambda v: str(v.get("video_id")))
+
+
+def dumps_videos(videos) -> str:
+    """Serialize the video payload compactly, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(videos, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(videos, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_csv_for_claude(df: pd.DataFrame) -> str:
+    """Write a DataFrame as fully quoted CSV text using pyarrow."""
+    buffer = pa.BufferOutputStream()
+    pacsv.write_csv(
+        pa.Table.from_pandas(df, preserve_index=False),
+        buffer,
+        write_options=pacsv.WriteOptions(quoting_style="all_valid"),
+    )
+    # decode straight from the Arrow buffer instead of copying it to bytes first
+    return str(buffer.getvalue(), "utf-8")
+
+
+def read_csv_response(text: str, columns: Iterable[str] = ()) -> pd.DataFrame:
+    """Parse a CSV answer from Claude into an Arrow-backed DataFrame.
+
+    Malformed rows are logged and skipped, like on_bad_lines="warn". A blank
+    answer gives an empty frame with the expected columns.
+    """
+    if not text.strip():
+        return pd.DataFrame(columns=list(columns))
+
+    def skip_invalid_row(row) -> str:
+        logger.warning("Skipping malformed CSV row from Claude: %s", row.text)
+        return "skip"
+
+    table = pacsv.read_csv(
+        pa.BufferReader(text.encode()),
+        parse_options=pacsv.ParseOptions(
+            newlines_in_values=True, invalid_row_handler=skip_invalid_row
+        ),
+    )
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
 def do_with_videos(
     client: Anthropic,
     videos: list,
@@ -46,11 +295,20 @@ def do_with_videos(
     prompt_version: int | None = None,
     settings: ClaudeConfig | None = None,
     debug=False,
-) -> str:
+    cache: CacheBackend | None = None,
+) -> Message | dict:
+    """Run a prompt over videos with a single synchronous request."""
     prompt_name = prompt_name or "rate_video_happiness"
     prompt_version = prompt_version or 2
     return range_video_happiness(
-        client, videos, prompt_definitions, prompt_name, prompt_version, settings, debug
+        client,
+        videos,
+        prompt_definitions,
+        prompt_name,
+        prompt_version,
+        settings,
+        debug,
+        cache=cache,
     )
 
 
@@ -63,18 +321,33 @@ def range_video_happiness(
     prompt_version: int | None = None,
     settings: ClaudeConfig | None = None,
     debug=False,
-) -> str:
-    settings = settings or default_settings()
+    cache_ttl: str | None = None,
+    cache: CacheBackend | None = None,
+    stream: bool = False,
+) -> Message | dict | Iterator[dict[str, str]]:
+    """Rate videos with a single Claude request.
+
+    With stream=True the CSV answer is parsed while Claude is still
+    generating it and an iterator of row dicts is returned instead of the
+    response; the local cache is not used in that mode. With debug=True the
+    request message is returned without calling Claude.
+    """
     prompt_name = prompt_name or "rate_video_happiness"
+    settings = settings or default_settings(prompt_name)
     prompt_version = prompt_version or 2
     prompt = get_prompt(prompt_definitions, prompt_name, prompt_version)
+    if isinstance(videos, list):
+        videos = dedupe_videos(videos)
     message = {
         "role": "user",
         "content": [
-            {"type": "text", "text": prompt},
-            {"type": "text", "text": json.dumps(videos)},
+            prompt_block(prompt, cache_ttl),
+            {"type": "text", "text": dumps_videos(videos)},
         ],
     }
     if debug:
         return message
-    return get_response(client, message, settings)
+    if stream:
+        return csv.DictReader(stream_response_lines(client, message, settings))
+    key = cache_key(settings.claude_model_version, prompt_name, prompt_version, videos)
+    return get_response(client, message, settings, cache=cache, key=key)
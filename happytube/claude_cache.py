@@ -0,0 +1,108 @@
+"""Exact-match cache for Claude responses.
+
+Re-running a stage on the same videos sends byte-identical requests, so the
+responses are stored under a hash of (model, prompt, version, videos) and
+reused instead of being billed again.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Protocol
+
+DEFAULT_CACHE_DIR = Path(".cache") / "claude"
+DEFAULT_TTL = 7 * 86400
+
+
+class CacheBackend(Protocol):
+    """Key/value store for serialized Claude responses."""
+
+    def get(self, key: str) -> str | None: ...
+
+    def set(self, key: str, value: str, ttl: int | None = DEFAULT_TTL) -> None: ...
+
+
+class MemoryCache:
+    """In-process cache, mostly useful for tests and notebooks."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[str, float | None]] = {}
+
+    def get(self, key: str) -> str | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.time():
+            del self._data[key]
+            return None
+        return value
+
+    def set(self, key: str, value: str, ttl: int | None = DEFAULT_TTL) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+
+
+class SqliteCache:
+    """On-disk cache backed by a single SQLite file."""
+
+    def __init__(self, path: Path):
+        """Initialize SqliteCache.
+
+        Args:
+            path: Path of the SQLite database file (created if missing)
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        # stages may call the cache from worker threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return None
+        return value
+
+    def set(self, key: str, value: str, ttl: int | None = DEFAULT_TTL) -> None:
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._lock, self._conn:
+            # get() only ignores expired rows, so drop them as new ones arrive
+            self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+
+def cache_key(model: str, prompt: str, version: int, videos: list | str) -> str:
+    """Build the cache key for a request.
+
+    Video lists are sorted by video_id so the key does not depend on the
+    order the files were read in.
+    """
+    if isinstance(videos, list):
+        videos = sorted(videos, key=lambda v: v.get("video_id", ""))
+    payload = {"model": model, "prompt": prompt, "version": version, "videos": videos}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def create_cache(cache_dir: Path = DEFAULT_CACHE_DIR) -> SqliteCache:
+    """Create the default on-disk response cache in cache_dir."""
+    return SqliteCache(cache_dir / "responses.sqlite")
@@ -1,8 +1,9 @@
 """CLI commands for HappyTube."""
 
 import asyncio
+import os
 import sys
-from datetime import date, datetime
+from datetime import date
 from functools import wraps
 from pathlib import Path
 
@@ -11,12 +12,9 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from happytube.config.config_manager import ConfigManager
-from happytube.config.settings import get_settings
-from happytube.stages.assess import AssessStage
-from happytube.stages.enhance import EnhanceStage
-from happytube.stages.fetch import FetchStage
-from happytube.stages.report import ReportStage
+# stdlib only; stages, settings and config are imported inside the commands
+# that need them so --help and status start quickly
+from happytube.claude_cache import DEFAULT_CACHE_DIR, CacheBackend, create_cache
 
 console = Console()
 
@@ -45,7 +43,7 @@ def parse_date(date_str: str | None) -> date:
         return date.today()
 
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d").date()
+        return date.fromisoformat(date_str)
     except ValueError:
         console.print(
             f"[red]✗ Invalid date format: {date_str}. Use YYYY-MM-DD format.[/red]"
@@ -53,8 +51,76 @@ def parse_date(date_str: str | None) -> date:
         sys.exit(1)
 
 
+def cache_options(f):
+    """Decorator adding the Claude response cache options to a command."""
+    f = click.option(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        type=click.Path(file_okay=False),
+        help="Directory for the local Claude response cache",
+    )(f)
+    f = click.option(
+        "--no-cache",
+        is_flag=True,
+        help="Always call Claude, ignoring cached responses",
+    )(f)
+    return f
+
+
+def open_cache(no_cache: bool, cache_dir: str):
+    """Open the local Claude response cache unless disabled."""
+    return None if no_cache else create_cache(Path(cache_dir))
+
+
+def count_stage_videos(stage_dir: Path) -> int | None:
+    """Count video_*.md files in a stage directory.
+
+    Args:
+        stage_dir: Stage directory for a single date
+
+    Returns:
+        Number of video files, or None if the directory doesn't exist
+    """
+    try:
+        with os.scandir(stage_dir) as entries:
+            return sum(
+                1
+                for entry in entries
+                if entry.name.startswith("video_")
+                and entry.name.endswith(".md")
+                and entry.is_file(follow_symlinks=False)
+            )
+    except FileNotFoundError:
+        return None
+
+
+def load_youtube_config(category: str) -> dict | None:
+    """Load the YouTube search params for a category.
+
+    Uses the shared ConfigManager, so the base YAML files are parsed once per
+    process no matter how many commands or stages ask for them.
+
+    Args:
+        category: YouTube category name (e.g. Music)
+
+    Returns:
+        Search params dictionary, or None if there is no config for the category
+    """
+    from happytube.config.config_manager import get_config_manager
+
+    config_manager = get_config_manager()
+    try:
+        config_manager.load_all_base_configs()
+        youtube_search = config_manager.get_youtube_search(f"{category.lower()}_search")
+    except (FileNotFoundError, KeyError):
+        return None
+    return youtube_search.get("params", {})
+
+
 def validate_credentials():
     """Validate that required API credentials are configured."""
+    from happytube.config.settings import get_settings
+
     try:
         settings = get_settings()
         if not settings.has_all_credentials:
@@ -127,22 +193,18 @@ def fetch(category: str, max_videos: int, date: str | None):
         )
     )
 
+    from happytube.stages.fetch import FetchStage
+
     try:
         # Load YouTube config if available
-        config_manager = ConfigManager()
-        youtube_config = {}
-
-        # Try to load category-specific config
-        try:
-            config_manager.load_all_base_configs()
-            # Map category name to config key
-            search_key = f"{category.lower()}_search"
-            youtube_search = config_manager.get_youtube_search(search_key)
-            youtube_config = youtube_search.get("params", {})
+        youtube_config = load_youtube_config(category)
+        if youtube_config is not None:
             console.print(
-                f"[green]✓ Loaded YouTube search config: {search_key}[/green]"
+                f"[green]✓ Loaded YouTube search config: "
+                f"{category.lower()}_search[/green]"
             )
-        except (FileNotFoundError, KeyError):
+        else:
+            youtube_config = {}
             console.print(
                 f"[yellow]⚠ No config found for '{category}', using defaults[/yellow]"
             )
@@ -173,8 +235,20 @@ def fetch(category: str, max_videos: int, date: str | None):
     "--date",
     help="Target date in YYYY-MM-DD format (defaults to today)",
 )
+@click.option(
+    "--model",
+    help="Claude model to use, overrides the per-prompt default (e.g. claude-3-opus-20240229)",
+)
+@click.option(
+    "--batch",
+    is_flag=True,
+    help="Use the Message Batches API (half price, results can take a while)",
+)
+@cache_options
 @require_credentials
-def assess(date: str | None):
+def assess(
+    date: str | None, model: str | None, batch: bool, no_cache: bool, cache_dir: str
+):
     """Assess video happiness using Claude AI.
 
     Loads videos from the fetch stage, sends them to Claude AI for happiness
@@ -193,9 +267,13 @@ def assess(date: str | None):
         )
     )
 
+    from happytube.stages.assess import AssessStage
+
     try:
         # Create and run assess stage
-        stage = AssessStage()
+        stage = AssessStage(
+            model=model, batch=batch, cache=open_cache(no_cache, cache_dir)
+        )
         result = asyncio.run(stage.run(target_date))
 
         # Display results
@@ -231,8 +309,25 @@ def assess(date: str | None):
     "--date",
     help="Target date in YYYY-MM-DD format (defaults to today)",
 )
+@click.option(
+    "--model",
+    help="Claude model to use, overrides the per-prompt default (e.g. claude-3-opus-20240229)",
+)
+@click.option(
+    "--batch",
+    is_flag=True,
+    help="Use the Message Batches API (half price, results can take a while)",
+)
+@cache_options
 @require_credentials
-def enhance(threshold: int, date: str | None):
+def enhance(
+    threshold: int,
+    date: str | None,
+    model: str | None,
+    batch: bool,
+    no_cache: bool,
+    cache_dir: str,
+):
     """Enhance video descriptions using Claude AI.
 
     Loads videos with happiness scores >= threshold from the assess stage,
@@ -257,9 +352,16 @@ def enhance(threshold: int, date: str | None):
         )
     )
 
+    from happytube.stages.enhance import EnhanceStage
+
     try:
         # Create and run enhance stage
-        stage = EnhanceStage(happiness_threshold=threshold)
+        stage = EnhanceStage(
+            happiness_threshold=threshold,
+            model=model,
+            cache=open_cache(no_cache, cache_dir),
+            batch=batch,
+        )
         result = asyncio.run(stage.run(target_date))
 
         # Display results
@@ -311,6 +413,8 @@ def report(date: str | None, days_back: int):
         )
     )
 
+    from happytube.stages.report import ReportStage
+
     try:
         # Create and run report stage
         stage = ReportStage()
@@ -339,6 +443,122 @@ def report(date: str | None, days_back: int):
         sys.exit(1)
 
 
+async def run_pipeline(
+    category: str,
+    max_videos: int,
+    threshold: int,
+    target_date: date,
+    model: str | None = None,
+    cache: CacheBackend | None = None,
+) -> dict:
+    """Run all stages one after another inside a single event loop.
+
+    Stages hand over through their directories, so each one starts once the
+    previous one has finished. Assess and enhance share one Claude client,
+    which is closed before the report is built.
+
+    Returns:
+        Dictionary of stage results keyed by stage name
+    """
+    from happytube.claude import create_async_client
+    from happytube.stages.assess import AssessStage
+    from happytube.stages.enhance import EnhanceStage
+    from happytube.stages.fetch import FetchStage
+    from happytube.stages.report import ReportStage
+
+    all_results = {}
+
+    # Stage 1: Fetch
+    console.print("\n[bold blue]Stage 1/4: Fetch[/bold blue]")
+    console.print("=" * 60)
+
+    youtube_config = load_youtube_config(category) or {}
+
+    fetch_stage = FetchStage(youtube_config=youtube_config, max_videos=max_videos)
+    fetch_result = await fetch_stage.run(target_date)
+    all_results["fetch"] = fetch_result
+
+    if fetch_result.get("new_videos", 0) == 0:
+        console.print("[yellow]⚠ No videos fetched, stopping pipeline[/yellow]")
+        return all_results
+
+    console.print(f"[green]✓ Fetched {fetch_result['new_videos']} videos[/green]\n")
+
+    # one Claude client (and connection pool) for assess and enhance; stages
+    # leave a client they were given open
+    client = create_async_client()
+    try:
+        # Stage 2: Assess
+        console.print("[bold blue]Stage 2/4: Assess[/bold blue]")
+        console.print("=" * 60)
+
+        # keep the prompt cached across back-to-back pipeline runs
+        assess_stage = AssessStage(
+            model=model, cache_ttl="1h", cache=cache, client=client
+        )
+        assess_result = await assess_stage.run(target_date)
+        all_results["assess"] = assess_result
+
+        if assess_result.get("assessed_videos", 0) == 0:
+            console.print(
+                "[yellow]⚠ No videos assessed, skipping remaining stages[/yellow]"
+            )
+            return all_results
+
+        console.print(
+            f"[green]✓ Assessed {assess_result['assessed_videos']} videos "
+            f"(avg: {assess_result.get('avg_happiness', 0)}/5)[/green]\n"
+        )
+
+        # Stage 3: Enhance
+        console.print("[bold blue]Stage 3/4: Enhance[/bold blue]")
+        console.print("=" * 60)
+
+        enhance_stage = EnhanceStage(
+            happiness_threshold=threshold, model=model, cache=cache, client=client
+        )
+        enhance_result = await enhance_stage.run(target_date)
+        all_results["enhance"] = enhance_result
+
+        console.print(
+            f"[green]✓ Enhanced {enhance_result['enhanced_videos']} videos[/green]\n"
+        )
+    finally:
+        await client.close()
+
+    # Stage 4: Report
+    console.print("[bold blue]Stage 4/4: Report[/bold blue]")
+    console.print("=" * 60)
+
+    report_stage = ReportStage()
+    report_result = await report_stage.run(target_date)
+    all_results["report"] = report_result
+
+    console.print(
+        f"[green]✓ Generated report for {report_result['videos_reported']} videos[/green]\n"
+    )
+
+    # Final summary
+    console.print(
+        Panel(
+            f"[green bold]✓ Pipeline completed successfully![/green bold]\n\n"
+            f"[bold]Summary:[/bold]\n"
+            f"  • Fetched: {fetch_result['new_videos']} videos\n"
+            f"  • Assessed: {assess_result['assessed_videos']} videos\n"
+            f"  • Enhanced: {enhance_result['enhanced_videos']} videos\n"
+            f"  • Reported: {report_result['videos_reported']} videos\n"
+            f"  • Avg Happiness: {assess_result.get('avg_happiness', 0)}/5",
+            title="🎉 Pipeline Complete",
+            border_style="green",
+        )
+    )
+
+    if report_result.get("report_path"):
+        console.print(f"\n[cyan]View report at: {report_result['report_path']}[/cyan]")
+
+    return all_results
+
+
 @cli.command()
 @click.option(
     "--category",
@@ -367,6 +587,11 @@ def report(date: str | None, days_back: int):
     type=int,
     help="Number of days to look back for analytics export",
 )
+@click.option(
+    "--model",
+    help="Claude model to use, overrides the per-prompt default (e.g. claude-3-opus-20240229)",
+)
+@cache_options
 @require_credentials
 def run_all(
     category: str,
@@ -374,6 +599,9 @@ def run_all(
     threshold: int,
     date: str | None,
     days_back: int,
+    model: str | None,
+    no_cache: bool,
+    cache_dir: str,
 ):
     """Run complete pipeline: fetch → assess → enhance → report.
 
@@ -398,97 +626,17 @@ def run_all(
         )
     )
 
-    all_results = {}
-
     try:
-        # Stage 1: Fetch
-        console.print("\n[bold blue]Stage 1/4: Fetch[/bold blue]")
-        console.print("=" * 60)
-
-        config_manager = ConfigManager()
-        youtube_config = {}
-
-        try:
-            config_manager.load_all_base_configs()
-            search_key = f"{category.lower()}_search"
-            youtube_search = config_manager.get_youtube_search(search_key)
-            youtube_config = youtube_search.get("params", {})
-        except (FileNotFoundError, KeyError):
-            pass
-
-        fetch_stage = FetchStage(youtube_config=youtube_config, max_videos=max_videos)
-        fetch_result = asyncio.run(fetch_stage.run(target_date))
-        all_results["fetch"] = fetch_result
-
-        if fetch_result.get("new_videos", 0) == 0:
-            console.print("[yellow]⚠ No videos fetched, stopping pipeline[/yellow]")
-            return
-
-        console.print(f"[green]✓ Fetched {fetch_result['new_videos']} videos[/green]\n")
-
-        # Stage 2: Assess
-        console.print("[bold blue]Stage 2/4: Assess[/bold blue]")
-        console.print("=" * 60)
-
-        assess_stage = AssessStage()
-        assess_result = asyncio.run(assess_stage.run(target_date))
-        all_results["assess"] = assess_result
-
-        if assess_result.get("assessed_videos", 0) == 0:
-            console.print(
-                "[yellow]⚠ No videos assessed, skipping remaining stages[/yellow]"
+        asyncio.run(
+            run_pipeline(
+                category,
+                max_videos,
+                threshold,
+                target_date,
+                model,
+                open_cache(no_cache, cache_dir),
             )
-            return
-
-        console.print(
-            f"[green]✓ Assessed {assess_result['assessed_videos']} videos "
-            f"(avg: {assess_result.get('avg_happiness', 0)}/5)[/green]\n"
         )
-
-        # Stage 3: Enhance
-        console.print("[bold blue]Stage 3/4: Enhance[/bold blue]")
-        console.print("=" * 60)
-
-        enhance_stage = EnhanceStage(happiness_threshold=threshold)
-        enhance_result = asyncio.run(enhance_stage.run(target_date))
-        all_results["enhance"] = enhance_result
-
-        console.print(
-            f"[green]✓ Enhanced {enhance_result['enhanced_videos']} videos[/green]\n"
-        )
-
-        # Stage 4: Report
-        console.print("[bold blue]Stage 4/4: Report[/bold blue]")
-        console.print("=" * 60)
-
-        report_stage = ReportStage()
-        report_result = asyncio.run(report_stage.run(target_date))
-        all_results["report"] = report_result
-
-        console.print(
-            f"[green]✓ Generated report for {report_result['videos_reported']} videos[/green]\n"
-        )
-
-        # Final summary
-        console.print(
-            Panel(
-                f"[green bold]✓ Pipeline completed successfully![/green bold]\n\n"
-                f"[bold]Summary:[/bold]\n"
-                f"  • Fetched: {fetch_result['new_videos']} videos\n"
-                f"  • Assessed: {assess_result['assessed_videos']} videos\n"
-                f"  • Enhanced: {enhance_result['enhanced_videos']} videos\n"
-                f"  • Reported: {report_result['videos_reported']} videos\n"
-                f"  • Avg Happiness: {assess_result.get('avg_happiness', 0)}/5",
-                title="🎉 Pipeline Complete",
-                border_style="green",
-            )
-        )
-
-        if report_result.get("report_path"):
-            console.print(
-                f"\n[cyan]View report at: {report_result['report_path']}[/cyan]"
-            )
-
     except KeyboardInterrupt:
         console.print("\n[yellow]⚠ Pipeline interrupted by user[/yellow]")
         sys.exit(1)
@@ -545,11 +693,9 @@ def status(date: str | None):
                 dir_str = "-"
         else:
             stage_dir = Path("stages") / stage_name / date_str
+            video_count = count_stage_videos(stage_dir)
 
-            if stage_dir.exists():
-                video_files = list(stage_dir.glob("video_*.md"))
-                video_count = len(video_files)
-
+            if video_count is not None:
                 if video_count > 0:
                     status_str = "✓ Complete"
                     count = str(video_count)
@@ -1,9 +1,20 @@
 """Configuration manager for loading YAML configuration files."""
 
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# libyaml's C loader when available, the pure-Python one otherwise
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=32)
+def _load_yaml(path_str: str, mtime_ns: int) -> dict[str, Any]:
+    """Parse a YAML file, memoized by path and modification time."""
+    with open(path_str, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
 
 class ConfigManager:
     """Manages loading and accessing YAML configuration files."""
@@ -39,11 +50,14 @@ class ConfigManager:
         else:
             config_path = self.base_path / f"{config_name}.yaml"
 
-        if not config_path.exists():
-            raise FileNotFoundError(f"Configuration file not found: {config_path}")
+        try:
+            mtime_ns = config_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Configuration file not found: {config_path}"
+            ) from None
 
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+        config = _load_yaml(str(config_path), mtime_ns)
 
         # Cache the config
         self._configs[config_name] = config
@@ -103,16 +117,19 @@ class ConfigManager:
         return youtube_config["searches"][search_name]
 
     def load_all_base_configs(self) -> None:
-        """Load all base configuration files."""
+        """Load all base configuration files not loaded yet."""
         config_files = ["app", "prompts", "youtube"]
         for config_name in config_files:
+            if config_name in self._configs:
+                continue
             config_path = self.base_path / f"{config_name}.yaml"
             if config_path.exists():
                 self.load_config(config_name)
 
 
+@lru_cache(maxsize=1)
 def get_config_manager() -> ConfigManager:
-    """Get a ConfigManager instance.
+    """Get the shared ConfigManager instance.
 
     Returns:
         ConfigManager instance with base path set to config/base
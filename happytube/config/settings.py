@@ -1,5 +1,7 @@
 """Application settings loaded from environment variables."""
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
 
@@ -51,9 +53,13 @@ class Settings(BaseSettings):
         return bool(self.youtube_api_key and self.anthropic_api_key)
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get application settings singleton.
 
+    The .env file is parsed once per process; call get_settings.cache_clear()
+    to pick up changes.
+
     Returns:
         Settings instance loaded from environment
     """
@@ -1,6 +1,11 @@
 # ruff: noqa
-get_ipython().run_line_magic("load_ext", "autoreload")
-get_ipython().run_line_magic("autoreload", "2")
+# startup script for `ipython -i happytube/ip.py`; not part of the package API
+try:
+    ip = get_ipython()
+    ip.run_line_magic("load_ext", "autoreload")
+    ip.run_line_magic("autoreload", "2")
+except NameError:  # plain python, no IPython shell
+    pass
 
 
 import os
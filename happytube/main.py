@@ -1,10 +1,15 @@
 import os
-from io import StringIO
 
 import pandas as pd
 from dotenv import load_dotenv
 
-from happytube.claude import create_client, do_with_videos, range_video_happiness
+from happytube.claude import (
+    create_client,
+    do_with_videos,
+    range_video_happiness,
+    read_csv_response,
+    write_csv_for_claude,
+)
 from happytube.prompts import prompt_definitions
 
 # from io import StringIO
@@ -23,15 +28,26 @@ def main():
     # todo: go through previously stored content and identify new videos
 
     cl = create_client()
-    happiness_response = range_video_happiness(cl, ls.get_csv(), prompt_definitions)
-    happiness = pd.read_csv(StringIO(happiness_response.content[0].text))
-
-    happy_videos = ls.get_df().merge(happiness, on="video_id")
-    happy_videos.sort_values("happiness", ascending=False)
-
-    videos_to_improve = happy_videos.loc[lambda x: x["happiness"] >= 3]
-
-    csv = videos_to_improve[["video_id", "description"]].to_csv(index=False, quoting=1)
+    videos = {video["video_id"]: video for video in ls.get_df().to_dict("records")}
+    # each row is merged as soon as it is parsed, while Claude is still
+    # generating the rest of the answer
+    happy_videos = {}
+    for row in range_video_happiness(cl, ls.get_csv(), prompt_definitions, stream=True):
+        video = videos.get(row.get("id") or row.get("video_id"))
+        try:
+            happiness = float(row.get("happiness") or "")
+        except ValueError:
+            continue
+        if video is not None and happiness >= 3:
+            happy_videos[video["video_id"]] = {**video, "happiness": happiness}
+
+    if not happy_videos:
+        # empty or unusable answer, nothing to improve
+        return
+
+    videos_to_improve = pd.DataFrame(list(happy_videos.values()))
+
+    csv = write_csv_for_claude(videos_to_improve[["video_id", "description"]])
     better_descriptions = do_with_videos(
         cl,
         csv,
@@ -40,5 +56,6 @@ def main():
         prompt_version=1,
     )
 
-    # todo: change on_bad_lines to function to log the content
-    bd = pd.read_csv(StringIO(better_descriptions.content[0].text), on_bad_lines="warn")
+    bd = read_csv_response(
+        better_descriptions.content[0].text, ["id", "language", "description_improved"]
+    )
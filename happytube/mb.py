@@ -46,8 +46,9 @@ def __():
 
 @app.cell
 def __(happiness, ls):
-    happy_videos = ls.get_df().merge(happiness, on="video_id")
-    happy_videos.sort_values("happiness", ascending=False)
+    happy_videos = ls.get_df().merge(
+        happiness, on="video_id", how="inner", validate="one_to_one"
+    )
     return (happy_videos,)
 
 
@@ -74,7 +75,7 @@ def __(StringIO, better_descriptions, pd):
 
 @app.cell
 def __(cl, do_with_videos, happy_videos, prompt_definitions):
-    videos_to_improve = happy_videos.loc[lambda x: x["happiness"] <= 3]
+    videos_to_improve = happy_videos.query("happiness <= 3")
     csv = videos_to_improve[["video_id", "description"]].to_csv(index=False, quoting=1)
     better_descriptions = do_with_videos(
         cl,
@@ -1,9 +1,16 @@
 """Markdown file handling with YAML frontmatter support."""
 
+import json
+import os
+import re
 import yaml
 from pathlib import Path
 from typing import Dict, Any
 
+# libyaml's C loader/dumper when available, the pure-Python ones otherwise
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 class MarkdownFile:
     """Represents a Markdown file with YAML frontmatter."""
@@ -28,27 +35,45 @@ class MarkdownFile:
         Returns:
             MarkdownFile instance with parsed frontmatter and content
         """
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
-
-        # Split frontmatter and content
-        if text.startswith("---\n"):
-            parts = text.split("---\n", 2)
-            frontmatter = yaml.safe_load(parts[1])
-            content = parts[2].strip()
-        else:
-            frontmatter = {}
-            content = text
+        frontmatter_yaml, content = _read_parts(file_path)
+        if frontmatter_yaml is None:
+            return cls({}, content)
 
+        # libyaml decodes the UTF-8 bytes itself
+        frontmatter = yaml.load(frontmatter_yaml, Loader=SafeLoader) or {}
         return cls(frontmatter, content)
 
+    @staticmethod
+    def load_scalar_fast(file_path: Path) -> tuple[dict[str, Any], str]:
+        """Load frontmatter and content, skipping YAML for flat frontmatter.
+
+        Frontmatter made of simple `key: value` lines (what the stages write)
+        is parsed with a regex; anything else goes through the YAML loader.
+
+        Args:
+            file_path: Path to the markdown file
+
+        Returns:
+            Tuple of (frontmatter, content)
+        """
+        frontmatter_yaml, content = _read_parts(file_path)
+        if frontmatter_yaml is None:
+            return {}, content
+
+        frontmatter = _parse_scalar_frontmatter(frontmatter_yaml.decode("utf-8"))
+        if frontmatter is None:
+            frontmatter = yaml.load(frontmatter_yaml, Loader=SafeLoader) or {}
+        return frontmatter, content
+
     def save(self, file_path: Path) -> None:
         """Save the Markdown file with frontmatter.
 
         Args:
             file_path: Path where the markdown file should be saved
         """
-        with open(file_path, "w", encoding="utf-8") as f:
+        with open(
+            file_path, "w", encoding="utf-8", newline="\n", buffering=1 << 16
+        ) as f:
             f.write(self.to_string())
 
     def to_string(self) -> str:
@@ -58,7 +83,10 @@ class MarkdownFile:
             Complete markdown file content with frontmatter
         """
         yaml_str = yaml.dump(
-            self.frontmatter, default_flow_style=False, sort_keys=False
+            self.frontmatter,
+            Dumper=SafeDumper,
+            default_flow_style=False,
+            sort_keys=False,
         )
         return f"---\n{yaml_str}---\n\n{self.content}"
 
@@ -69,3 +97,122 @@ class MarkdownFile:
             updates: Dictionary of values to update in frontmatter
         """
         self.frontmatter.update(updates)
+
+
+def _read_parts(file_path: Path) -> tuple[bytes | None, str]:
+    """Read a markdown file and split off the frontmatter.
+
+    Returns:
+        Tuple of (frontmatter YAML bytes or None, decoded content)
+    """
+    # bytes + one decode skips the text-mode newline translation
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    if b"\r\n" in raw:  # e.g. edited on Windows
+        raw = raw.replace(b"\r\n", b"\n")
+
+    # Split frontmatter and content at the closing "---" line
+    end = raw.find(b"\n---\n", 3) if raw.startswith(b"---\n") else -1
+    if end == -1:
+        return None, raw.decode("utf-8")
+    return raw[4 : end + 1], raw[end + 5 :].decode("utf-8").strip()
+
+
+_SCALAR_RE = re.compile(r"([A-Za-z_]\w*):(?: (.*))?")
+_INT_RE = re.compile(r"-?(?:0|[1-9][0-9]*)")
+_PLAIN_CONSTANTS = {
+    "": None,
+    "~": None,
+    "null": None,
+    "Null": None,
+    "NULL": None,
+    "true": True,
+    "True": True,
+    "TRUE": True,
+    "false": False,
+    "False": False,
+    "FALSE": False,
+    "yes": True,
+    "Yes": True,
+    "YES": True,
+    "no": False,
+    "No": False,
+    "NO": False,
+    "on": True,
+    "On": True,
+    "ON": True,
+    "off": False,
+    "Off": False,
+    "OFF": False,
+}
+# plain scalars starting with these may be numbers, dates or YAML syntax
+_NOT_PLAIN_START = frozenset("0123456789+-.[]{}|>&*!%@`#?:,\"'")
+
+
+def _parse_scalar_frontmatter(text: str) -> dict[str, Any] | None:
+    """Parse frontmatter made only of single-line `key: scalar` entries.
+
+    Returns:
+        Parsed frontmatter, or None if the YAML loader is needed
+    """
+    frontmatter = {}
+    for line in text.splitlines():
+        match = _SCALAR_RE.fullmatch(line)
+        if match is None:
+            return None
+        key, value = match.groups()
+        value = (value or "").strip()
+        if key in _PLAIN_CONSTANTS:
+            return None
+
+        if value in _PLAIN_CONSTANTS:
+            frontmatter[key] = _PLAIN_CONSTANTS[value]
+        elif _INT_RE.fullmatch(value):
+            frontmatter[key] = int(value)
+        elif value.startswith("'"):
+            if len(value) < 2 or not value.endswith("'"):
+                return None
+            inner = value[1:-1]
+            if "'" in inner.replace("''", ""):
+                return None
+            frontmatter[key] = inner.replace("''", "'")
+        elif value.startswith('"'):
+            # JSON strings are a subset of YAML double-quoted scalars
+            try:
+                parsed = json.loads(value)
+            except ValueError:
+                return None
+            if not isinstance(parsed, str):
+                return None
+            frontmatter[key] = parsed
+        elif value[0] in _NOT_PLAIN_START or ": " in value or " #" in value:
+            return None
+        else:
+            frontmatter[key] = value
+    return frontmatter
+
+
+def list_video_files(directory: Path) -> list[Path]:
+    """List the video_*.md files in a stage directory, sorted by name.
+
+    Uses os.scandir, whose entries carry the file type from the directory
+    read, instead of globbing.
+
+    Args:
+        directory: Stage directory for a single date
+
+    Returns:
+        Paths of the video files (empty if the directory doesn't exist)
+    """
+    try:
+        with os.scandir(directory) as entries:
+            names = sorted(
+                entry.name
+                for entry in entries
+                if entry.name.startswith("video_")
+                and entry.name.endswith(".md")
+                and entry.is_file()
+            )
+    except FileNotFoundError:
+        return []
+    return [directory / name for name in names]
@@ -1,10 +1,12 @@
 """Video model with analytics export capabilities."""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Optional
 
 import pandas as pd
+import pyarrow as pa
 from pydantic import BaseModel, Field
 
 
@@ -66,39 +68,111 @@ class Video(BaseModel):
         return self.model_dump()
 
     @classmethod
-    def df_from_stage_dir(cls, stage_name: str, days_back: int = 7) -> pd.DataFrame:
+    def df_from_stage_dir(
+        cls, stage_name: str, days_back: int = 7, end_date: date | None = None
+    ) -> pd.DataFrame:
         """Load videos from stage directory into DataFrame.
 
         Args:
             stage_name: Name of the stage (fetch, assess, enhance)
-            days_back: Number of days to look back from today
+            days_back: Number of days to look back from end_date
+            end_date: Last date to include (defaults to today)
 
         Returns:
             DataFrame containing all videos from the specified stage and date range
         """
-        from happytube.models.markdown import MarkdownFile
-
         base_path = Path("stages") / stage_name
-        end_date = date.today()
+        end_date = end_date or date.today()
         start_date = end_date - timedelta(days=days_back - 1)
 
-        all_videos = []
+        frames = []
         current_date = start_date
 
         while current_date <= end_date:
             date_dir = base_path / current_date.strftime("%Y-%m-%d")
-            if date_dir.exists():
-                for md_file_path in date_dir.glob("video_*.md"):
-                    try:
-                        md_file = MarkdownFile.load(md_file_path)
-                        video = cls.from_frontmatter(md_file.frontmatter)
-                        all_videos.append(video.to_pandas_dict())
-                    except Exception:
-                        # Skip files that can't be parsed
-                        pass
+            df = cls.df_from_date_dir(date_dir)
+            if not df.empty:
+                frames.append(df)
             current_date += timedelta(days=1)
 
-        return pd.DataFrame(all_videos) if all_videos else pd.DataFrame()
+        if not frames:
+            return cls._df_from_records([])
+        return pd.concat(frames, ignore_index=True)
+
+    @classmethod
+    def df_from_date_dir(cls, date_dir: Path) -> pd.DataFrame:
+        """Load the videos of a single date directory.
+
+        The frame is also written to a Parquet snapshot in the directory and
+        reused until a video file is added, removed or modified. Within one
+        process an unchanged directory is served from memory.
+
+        Args:
+            date_dir: Stage directory for a single date
+
+        Returns:
+            DataFrame containing the videos in the directory
+        """
+        from happytube.models.markdown import MarkdownFile, list_video_files
+
+        paths = list_video_files(date_dir)
+        if not paths:
+            return cls._df_from_records([])
+
+        snapshot = date_dir / SNAPSHOT_NAME
+        try:
+            newest = max(
+                date_dir.stat().st_mtime_ns, *(p.stat().st_mtime_ns for p in paths)
+            )
+            snapshot_mtime = snapshot.stat().st_mtime_ns
+            if snapshot_mtime >= newest:
+                memo_key = (date_dir.resolve(), snapshot_mtime)
+                if memo_key not in _FRAMES:
+                    _FRAMES[memo_key] = pd.read_parquet(snapshot)
+                return _FRAMES[memo_key].copy()
+        except FileNotFoundError:
+            pass
+
+        def load_one(md_file_path: Path) -> dict | None:
+            try:
+                frontmatter, _ = MarkdownFile.load_scalar_fast(md_file_path)
+            except Exception:
+                # Skip files that can't be parsed
+                return None
+            if isinstance(frontmatter, dict) and "video_id" in frontmatter:
+                return frontmatter
+            return None
+
+        # loading is mostly file I/O, so threads overlap well
+        with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+            all_videos = [v for v in executor.map(load_one, paths) if v is not None]
+
+        df = cls._df_from_records(all_videos)
+        try:
+            cls.to_parquet(df, snapshot)
+        except (OSError, pa.ArrowException):
+            # a read-only stage directory, or a column mixing types that
+            # Parquet cannot store, just means no snapshot
+            return df
+        _FRAMES[(date_dir.resolve(), snapshot.stat().st_mtime_ns)] = df
+        return df.copy()
+
+    @staticmethod
+    def _df_from_records(records: list[dict]) -> pd.DataFrame:
+        """Build a DataFrame with the Video columns from frontmatter dicts.
+
+        Frontmatter goes in as-is; types are coerced per column instead of
+        validating every row through the model. An empty result still has
+        the full set of columns.
+        """
+        df = pd.DataFrame.from_records(records, columns=FIELDS)
+        for field in DATETIME_FIELDS:
+            df[field] = pd.to_datetime(df[field], utc=True, errors="coerce")
+        for field in INT_FIELDS:
+            # e.g. duration: "2:00" instead of seconds; the model rejected it
+            df[field] = pd.to_numeric(df[field], errors="coerce")
+        df["prompt_version"] = df["prompt_version"].astype("string")
+        return df
 
     @classmethod
     def to_parquet(cls, df: pd.DataFrame, output_path: Path) -> None:
@@ -110,3 +184,12 @@ class Video(BaseModel):
         """
         output_path.parent.mkdir(parents=True, exist_ok=True)
         df.to_parquet(output_path, engine="pyarrow", compression="snappy", index=False)
+
+
+FIELDS = tuple(Video.model_fields)
+DATETIME_FIELDS = ("fetched_at", "assessed_at", "enhanced_at")
+INT_FIELDS = ("duration", "happiness_score")
+# per-date cache of df_from_stage_dir, next to the markdown files
+SNAPSHOT_NAME = "_videos.parquet"
+# snapshots already read in this process, by (date_dir, snapshot mtime)
+_FRAMES: dict[tuple[Path, int], pd.DataFrame] = {}
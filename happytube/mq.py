@@ -1,17 +1,21 @@
 import asyncio
 import os
-from io import StringIO
 
-import pandas as pd
-from client import create_client, do_with_videos, range_video_happiness
+from client import (
+    create_client,
+    do_with_videos,
+    range_video_happiness,
+    read_csv_response,
+    write_csv_for_claude,
+)
 from dotenv import load_dotenv
 from search import Search
 
 
 async def fetch_videos(queue):
+    _ = load_dotenv()
+    ytkey = os.getenv("YTKEY")
     while True:
-        _ = load_dotenv()
-        ytkey = os.getenv("YTKEY")
         ls = Search()
         ls.set_param("key", ytkey)
         ls.set_param("videoDuration", "long")
@@ -29,28 +33,29 @@ async def get_multiple_items(queue, num_items):
 
 
 async def measure_happiness(queue_in, queue_out):
+    cl = create_client()
     while True:
         ls_list = await get_multiple_items(queue_in, 10)
         for ls in ls_list:
-            cl = create_client()
             happiness_response = range_video_happiness(
                 cl, ls.get_csv(), prompt_definitions
             )
-            happiness = pd.read_csv(StringIO(happiness_response.content[0].text))
-            happy_videos = ls.get_df().merge(happiness, on="video_id")
-            happy_videos.sort_values("happiness", ascending=False)
-            videos_to_improve = happy_videos.loc[lambda x: x["happiness"] >= 3]
+            happiness = read_csv_response(
+                happiness_response.content[0].text, ["video_id", "happiness"]
+            )
+            happy_videos = ls.get_df().merge(
+                happiness, on="video_id", how="inner", validate="one_to_one"
+            )
+            videos_to_improve = happy_videos.query("happiness >= 3")
             await queue_out.put(videos_to_improve)
 
 
 async def improve_descriptions(queue):
+    cl = create_client()
     while True:
         videos_to_improve_list = await get_multiple_items(queue, 10)
         for videos_to_improve in videos_to_improve_list:
-            csv = videos_to_improve[["video_id", "description"]].to_csv(
-                index=False, quoting=1
-            )
-            cl = create_client()
+            csv = write_csv_for_claude(videos_to_improve[["video_id", "description"]])
             better_descriptions = do_with_videos(
                 cl,
                 csv,
@@ -58,8 +63,9 @@ async def improve_descriptions(queue):
                 prompt_name="make_description_meaningful",
                 prompt_version=1,
             )
-            bd = pd.read_csv(
-                StringIO(better_descriptions.content[0].text), on_bad_lines="warn"
+            bd = read_csv_response(
+                better_descriptions.content[0].text,
+                ["id", "language", "description_improved"],
             )
             print(bd)
 
@@ -2,7 +2,7 @@ from collections import namedtuple
 
 PromptDef = namedtuple("PromptDef", ["name", "version", "prompt"])
 
-prompt_definitions = [
+prompt_definitions = (
     PromptDef(
         name="rate_video_happiness",
         version=1,
@@ -33,10 +33,15 @@ Otherwise leave the description intact, including emoticons.
 Please provide the answer in csv format (no extra text, just the response), just 3 columns: `id`, `language` and `description_improved` Please embed the `description_improved` column in quotes.
 """,
     ),
-]
+)
 
+# (name, version) -> prompt text for the built-in definitions
+_PROMPT_INDEX = {(p.name, p.version): p.prompt for p in prompt_definitions}
 
-def get_prompt(prompt_definitions, name, version):
+
+def get_prompt(definitions, name, version):
+    if definitions is prompt_definitions:
+        return _PROMPT_INDEX[(name, version)]
     return next(
-        p.prompt for p in prompt_definitions if p.name == name and p.version == version
+        p.prompt for p in definitions if p.name == name and p.version == version
     )
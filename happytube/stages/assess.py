@@ -1,22 +1,46 @@
 """Assess stage - evaluates video happiness using Claude AI."""
 
+import asyncio
 import csv
 import io
-import os
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, date, datetime
 from pathlib import Path
 from typing import Dict, Any
 
-from anthropic import Anthropic
-from dotenv import load_dotenv
+import pandas as pd
+from anthropic import AsyncAnthropic
+from anthropic.types import Message
+from anthropic.types.message_create_params import MessageCreateParamsNonStreaming
+from anthropic.types.messages.batch_create_params import Request
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from happytube.models.markdown import MarkdownFile
+from happytube.claude import (
+    BATCH_POLL_INTERVAL,
+    BATCH_TIMEOUT,
+    DEFAULT_MODEL,
+    ClaudeConfig,
+    aget_response,
+    create_async_client,
+    is_cacheable,
+    model_for_prompt,
+    prompt_block,
+    run_batch,
+)
+from happytube.claude_cache import CacheBackend, cache_key
+from happytube.models.markdown import MarkdownFile, list_video_files
 from happytube.prompts import get_prompt, prompt_definitions
-from happytube.stages.base import Stage
+from happytube.stages.base import SAVE_WORKERS, Stage
+from happytube.utils.logging import get_logger
 
 console = Console()
+logger = get_logger(__name__)
+
+# videos per Claude request; keeps each CSV answer well under max_tokens
+CHUNK_SIZE = 50
+# concurrent chunk requests; keeps a big fetch under the rate limits
+MAX_CONCURRENCY = 4
 
 
 class AssessStage(Stage):
@@ -26,29 +50,52 @@ class AssessStage(Stage):
         self,
         prompt_name: str = "rate_video_happiness",
         prompt_version: int = 2,
-        model: str = "claude-3-opus-20240229",
+        model: str | None = None,
         max_tokens: int = 4096,
+        cache_ttl: str | None = None,
+        cache: CacheBackend | None = None,
+        client: AsyncAnthropic | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        max_concurrency: int = MAX_CONCURRENCY,
+        batch: bool = False,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        batch_timeout: float = BATCH_TIMEOUT,
     ):
         """Initialize AssessStage.
 
         Args:
             prompt_name: Name of the prompt to use
             prompt_version: Version of the prompt
-            model: Claude model to use
+            model: Claude model to use (defaults to the model for the prompt)
             max_tokens: Maximum tokens for Claude response
+            cache_ttl: Prompt cache TTL (e.g. "1h"), default 5 minutes
+            cache: Optional local cache for Claude responses
+            client: Async Anthropic client to use (created per run if not given)
+            chunk_size: Number of videos rated per Claude request
+            max_concurrency: Maximum number of concurrent Claude requests
+            batch: Submit all chunks as one Message Batch (half price, but
+                results can take minutes to hours)
+            poll_interval: Seconds between batch status checks
+            batch_timeout: Seconds to wait for a batch before canceling it
         """
         super().__init__("assess")
         self.prompt_name = prompt_name
         self.prompt_version = prompt_version
-        self.model = model
+        self.model = model or model_for_prompt.get(prompt_name, DEFAULT_MODEL)
         self.max_tokens = max_tokens
-        self.client = None
-
-    def _ensure_client(self) -> Anthropic:
+        self.cache_ttl = cache_ttl
+        self.cache = cache
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self.batch = batch
+        self.poll_interval = poll_interval
+        self.batch_timeout = batch_timeout
+
+    def _ensure_client(self) -> AsyncAnthropic:
         """Ensure Anthropic client is initialized."""
         if self.client is None:
-            load_dotenv()
-            self.client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+            self.client = create_async_client()
         return self.client
 
     def _load_videos_from_fetch(self, target_date: date) -> list[MarkdownFile]:
@@ -62,18 +109,13 @@ class AssessStage(Stage):
         """
         fetch_dir = Path("stages") / "fetch" / target_date.strftime("%Y-%m-%d")
 
-        if not fetch_dir.exists():
-            return []
-
         videos = []
-        for md_path in sorted(fetch_dir.glob("video_*.md")):
+        for md_path in list_video_files(fetch_dir):
             try:
                 md_file = MarkdownFile.load(md_path)
                 videos.append(md_file)
             except Exception as e:
-                console.print(
-                    f"[yellow]⚠ Error loading {md_path.name}: {str(e)}[/yellow]"
-                )
+                logger.warning("Error loading %s: %s", md_path.name, e)
 
         return videos
 
@@ -92,11 +134,9 @@ class AssessStage(Stage):
 
         for video in videos:
             fm = video.frontmatter
-            # Get first 500 chars of description from content
-            description = (
-                video.content.split("\n\n", 1)[1] if "\n\n" in video.content else ""
-            )
-            description = description[:500]  # Limit description length
+            # Get first 500 chars of description from content (after the title)
+            start = video.content.find("\n\n")
+            description = video.content[start + 2 : start + 502] if start != -1 else ""
 
             writer.writerow([fm.get("video_id", ""), fm.get("title", ""), description])
 
@@ -111,27 +151,145 @@ class AssessStage(Stage):
         Returns:
             Dictionary mapping video_id to {happiness, reasoning}
         """
-        results = {}
+        if not response_text.strip():
+            return {}
+
         try:
-            # Parse CSV response
-            reader = csv.DictReader(io.StringIO(response_text))
-            for row in reader:
-                video_id = row.get("id", row.get("video_id", ""))
-                happiness = row.get("happiness", "")
-                # Try to parse happiness as int
-                try:
-                    happiness_score = int(happiness)
-                except (ValueError, TypeError):
-                    happiness_score = 0
-
-                results[video_id] = {
-                    "happiness_score": happiness_score,
-                    "happiness_reasoning": row.get("reasoning", ""),
-                }
+            # Parse CSV response; everything as text so ids are kept verbatim
+            df = pd.read_csv(
+                io.StringIO(response_text),
+                dtype=str,
+                keep_default_na=False,
+                on_bad_lines="warn",
+            )
         except Exception as e:
             console.print(f"[red]✗ Error parsing Claude response: {str(e)}[/red]")
+            return {}
+
+        id_col = "id" if "id" in df.columns else "video_id"
+        if id_col not in df.columns:
+            return {}
+        df = df.drop_duplicates(id_col, keep="last").set_index(id_col)
+
+        if "happiness" in df.columns:
+            scores = pd.to_numeric(df["happiness"], errors="coerce")
+        else:
+            scores = pd.Series(index=df.index, dtype=float)
+        results = pd.DataFrame(
+            {
+                "happiness_score": scores.fillna(0).astype(int),
+                "happiness_reasoning": df.get("reasoning", ""),
+            }
+        )
+        return results.to_dict("index")
+
+    def _chunk_message(
+        self, prompt: str, videos: list[MarkdownFile]
+    ) -> tuple[dict, str]:
+        """Build the Claude message rating one chunk of videos.
 
-        return results
+        Args:
+            prompt: Prompt text
+            videos: Videos to rate together
+
+        Returns:
+            Tuple of the user message and its response cache key
+        """
+        csv_content = self._prepare_csv_for_claude(videos)
+        message = {
+            "role": "user",
+            "content": [
+                prompt_block(prompt, self.cache_ttl),
+                {"type": "text", "text": csv_content},
+            ],
+        }
+        key = cache_key(self.model, self.prompt_name, self.prompt_version, csv_content)
+        return message, key
+
+    async def _assess_chunk(
+        self, client: AsyncAnthropic, prompt: str, videos: list[MarkdownFile]
+    ) -> Message:
+        """Rate one chunk of videos with a single Claude request.
+
+        Args:
+            client: Async Anthropic client
+            prompt: Prompt text
+            videos: Videos to rate together
+
+        Returns:
+            Claude response message
+        """
+        message, key = self._chunk_message(prompt, videos)
+        return await aget_response(
+            client,
+            message,
+            ClaudeConfig(self.model, self.max_tokens),
+            cache=self.cache,
+            key=key,
+        )
+
+    async def _assess_chunks_batch(
+        self,
+        client: AsyncAnthropic,
+        prompt: str,
+        chunks: list[list[MarkdownFile]],
+    ) -> list[Message | Exception]:
+        """Rate all chunks through the Message Batches API.
+
+        Chunks found in the response cache are not resubmitted.
+
+        Args:
+            client: Async Anthropic client
+            prompt: Prompt text
+            chunks: Chunks of videos, one request each
+
+        Returns:
+            One entry per chunk: the response, or the error for a chunk whose
+            request did not succeed
+        """
+        responses: list[Message | Exception | None] = [None] * len(chunks)
+        keys = {}  # custom_id -> (chunk index, cache key)
+        requests = []
+        for i, chunk in enumerate(chunks):
+            message, key = self._chunk_message(prompt, chunk)
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                responses[i] = Message.model_validate_json(cached)
+                continue
+            custom_id = f"chunk-{i}"
+            keys[custom_id] = (i, key)
+            requests.append(
+                Request(
+                    custom_id=custom_id,
+                    params=MessageCreateParamsNonStreaming(
+                        model=self.model,
+                        max_tokens=self.max_tokens,
+                        messages=[message],
+                    ),
+                )
+            )
+
+        if requests:
+            try:
+                results = await run_batch(
+                    client, requests, self.poll_interval, self.batch_timeout
+                )
+            except Exception as e:
+                # cached chunks are still good
+                results = {}
+                for i, _ in keys.values():
+                    responses[i] = e
+            for custom_id, (i, key) in keys.items():
+                if responses[i] is not None:
+                    continue
+                if custom_id not in results:
+                    responses[i] = RuntimeError(f"batch request {custom_id} failed")
+                    continue
+                response = responses[i] = results[custom_id]
+                if self.cache is not None and is_cacheable(response):
+                    self.cache.set(key, response.model_dump_json())
+
+        return responses
 
     async def run(self, target_date: date) -> Dict[str, Any]:
         """Assess video happiness and update markdown files.
@@ -143,6 +301,7 @@ class AssessStage(Stage):
             Dictionary containing execution statistics
         """
         stage_dir = self.ensure_stage_dir(target_date)
+        owns_client = self.client is None
 
         console.print(
             f"[bold blue]🎯 Assessing videos for {target_date.strftime('%Y-%m-%d')}...[/bold blue]"
@@ -165,9 +324,6 @@ class AssessStage(Stage):
                 f"[green]✓ Loaded {len(videos)} videos from fetch stage[/green]"
             )
 
-            # Prepare CSV for Claude
-            csv_content = self._prepare_csv_for_claude(videos)
-
             # Get prompt
             prompt = get_prompt(
                 prompt_definitions, self.prompt_name, self.prompt_version
@@ -175,6 +331,11 @@ class AssessStage(Stage):
 
             # Call Claude API
             client = self._ensure_client()
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            chunks = [
+                videos[i : i + self.chunk_size]
+                for i in range(0, len(videos), self.chunk_size)
+            ]
 
             with Progress(
                 SpinnerColumn(),
@@ -182,75 +343,101 @@ class AssessStage(Stage):
                 console=console,
             ) as progress:
                 task = progress.add_task(
-                    "Calling Claude API for happiness assessment...", total=None
+                    f"Calling Claude API for happiness assessment "
+                    f"({len(chunks)} request(s))...",
+                    total=None,
                 )
 
-                message = {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {"type": "text", "text": csv_content},
-                    ],
-                }
+                async def assess_chunk(chunk: list[MarkdownFile]):
+                    async with semaphore:
+                        return await self._assess_chunk(client, prompt, chunk)
 
-                response = client.messages.create(
-                    model=self.model,
-                    messages=[message],
-                    max_tokens=self.max_tokens,
-                )
+                if self.batch:
+                    responses = await self._assess_chunks_batch(client, prompt, chunks)
+                else:
+                    # a failed chunk must not discard the answers of the others
+                    responses = await asyncio.gather(
+                        *(assess_chunk(chunk) for chunk in chunks),
+                        return_exceptions=True,
+                    )
 
                 progress.update(task, completed=True)
 
-            # Extract text from response
-            response_text = response.content[0].text if response.content else ""
-
             console.print("[green]✓ Received response from Claude[/green]")
 
-            # Parse response
-            assessment_results = self._parse_claude_response(response_text)
+            # Parse responses; videos of failed chunks are not saved
+            assessment_results = {}
+            errors = []
+            videos = []
+            for number, (chunk, response) in enumerate(zip(chunks, responses), 1):
+                if isinstance(response, Exception):
+                    error_msg = (
+                        f"Error assessing chunk {number}/{len(chunks)} "
+                        f"({len(chunk)} videos): {response}"
+                    )
+                    errors.append(error_msg)
+                    logger.error(error_msg)
+                    continue
+                # Extract text from response
+                response_text = response.content[0].text if response.content else ""
+                assessment_results.update(self._parse_claude_response(response_text))
+                videos.extend(chunk)
 
             # Save assessed videos
             assessed_count = 0
-            errors = []
+            # the whole run is one assessment, so all videos share a timestamp
+            assessed_at = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 console=console,
+                # per-item updates; a few redraws a second are plenty
+                refresh_per_second=4,
             ) as progress:
                 task = progress.add_task("Saving assessed videos...", total=len(videos))
 
-                for video in videos:
+                def save_one(video: MarkdownFile) -> None:
+                    video_id = video.frontmatter.get("video_id", "")
+                    assessment = assessment_results.get(video_id, {})
+
+                    # Update frontmatter
+                    video.update_frontmatter(
+                        {
+                            "stage": "assessed",
+                            "assessed_at": assessed_at,
+                            "happiness_score": assessment.get("happiness_score", 0),
+                            "happiness_reasoning": assessment.get(
+                                "happiness_reasoning", ""
+                            ),
+                            "prompt_name": self.prompt_name,
+                            "prompt_version": self.prompt_version,
+                        }
+                    )
+
+                    # Save to assess stage
+                    video.save(stage_dir / f"video_{video_id}.md")
+
+                loop = asyncio.get_running_loop()
+
+                async def save_in_thread(video: MarkdownFile) -> None:
+                    nonlocal assessed_count
                     try:
-                        video_id = video.frontmatter.get("video_id", "")
-                        assessment = assessment_results.get(video_id, {})
-
-                        # Update frontmatter
-                        video.update_frontmatter(
-                            {
-                                "stage": "assessed",
-                                "assessed_at": datetime.utcnow().isoformat() + "Z",
-                                "happiness_score": assessment.get("happiness_score", 0),
-                                "happiness_reasoning": assessment.get(
-                                    "happiness_reasoning", ""
-                                ),
-                                "prompt_name": self.prompt_name,
-                                "prompt_version": self.prompt_version,
-                            }
-                        )
-
-                        # Save to assess stage
-                        output_path = stage_dir / f"video_{video_id}.md"
-                        video.save(output_path)
+                        await loop.run_in_executor(executor, save_one, video)
                         assessed_count += 1
-
                     except Exception as e:
+                        video_id = video.frontmatter.get("video_id", "")
                         error_msg = f"Error saving assessed video {video_id}: {str(e)}"
                         errors.append(error_msg)
-                        console.print(f"[red]✗ {error_msg}[/red]")
+                        logger.error(error_msg)
 
                     progress.update(task, advance=1)
 
+                # saves are independent file writes; the pool runs them while
+                # the event loop stays free
+                with ThreadPoolExecutor(max_workers=SAVE_WORKERS) as executor:
+                    await asyncio.gather(*(save_in_thread(video) for video in videos))
+
             if errors:
                 console.print(f"[yellow]⚠ Completed with {len(errors)} errors[/yellow]")
             else:
@@ -285,3 +472,8 @@ class AssessStage(Stage):
                 "error_message": error_msg,
                 "date": target_date.strftime("%Y-%m-%d"),
             }
+        finally:
+            # the aiohttp session is bound to this event loop
+            if owns_client and self.client is not None:
+                await self.client.close()
+                self.client = None
@@ -5,6 +5,9 @@ from pathlib import Path
 from datetime import date
 from typing import Dict, Any
 
+# threads for writing a stage's markdown files
+SAVE_WORKERS = 8
+
 
 class Stage(ABC):
     """Base class for all processing stages."""
@@ -1,19 +1,56 @@
 """Enhance stage - improves video descriptions using Claude AI."""
 
-import os
-from datetime import date, datetime
+import asyncio
+import re
+from datetime import UTC, date, datetime
 from pathlib import Path
 from typing import Dict, Any
 
-from anthropic import Anthropic
-from dotenv import load_dotenv
+from anthropic import AsyncAnthropic
+from anthropic.types import Message
+from anthropic.types.message_create_params import MessageCreateParamsNonStreaming
+from anthropic.types.messages.batch_create_params import Request
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+from happytube.claude import (
+    BATCH_POLL_INTERVAL,
+    BATCH_TIMEOUT,
+    DEFAULT_MODEL,
+    ClaudeConfig,
+    aget_response,
+    create_async_client,
+    is_cacheable,
+    model_for_prompt,
+    run_batch,
+)
+from happytube.claude_cache import CacheBackend, cache_key
 from happytube.models.markdown import MarkdownFile
+from happytube.models.video import Video
 from happytube.stages.base import Stage
+from happytube.utils.logging import get_logger
 
 console = Console()
+logger = get_logger(__name__)
+
+# static instructions; only the title and description change per video
+PROMPT_TEMPLATE = """Improve this YouTube video description by removing:
+- Clickbait language
+- "Like and subscribe" spam
+- Excessive links
+- Overly promotional content
+- Social media handles
+
+Keep the core information that describes what the video is about.
+Return ONLY the enhanced description, nothing else.
+
+Title: {title}
+Description: {description}
+
+Enhanced Description:"""
+
+_URL_RE = re.compile(r"https?://\S+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n\s*")
 
 
 class EnhanceStage(Stage):
@@ -24,8 +61,15 @@ class EnhanceStage(Stage):
         happiness_threshold: int = 3,
         prompt_name: str = "make_description_meaningful",
         prompt_version: int = 1,
-        model: str = "claude-3-opus-20240229",
+        model: str | None = None,
         max_tokens: int = 2048,
+        max_concurrency: int = 8,
+        cache: CacheBackend | None = None,
+        batch: bool = False,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        batch_timeout: float = BATCH_TIMEOUT,
+        max_input_chars: int = 2000,
+        client: AsyncAnthropic | None = None,
     ):
         """Initialize EnhanceStage.
 
@@ -33,27 +77,45 @@ class EnhanceStage(Stage):
             happiness_threshold: Minimum happiness score to enhance (default: 3)
             prompt_name: Name of the prompt to use
             prompt_version: Version of the prompt
-            model: Claude model to use
+            model: Claude model to use (defaults to the model for the prompt)
             max_tokens: Maximum tokens for Claude response
+            max_concurrency: Maximum number of concurrent Claude requests
+            cache: Optional local cache for Claude responses
+            batch: Submit all descriptions as one Message Batch (half price,
+                but results can take minutes to hours)
+            poll_interval: Seconds between batch status checks
+            batch_timeout: Seconds to wait for a batch before canceling it
+            max_input_chars: Descriptions are cut to this many characters
+                (after dropping URLs) before they are sent to Claude
+            client: Async Anthropic client to use (created per run if not given)
         """
         super().__init__("enhance")
         self.happiness_threshold = happiness_threshold
         self.prompt_name = prompt_name
         self.prompt_version = prompt_version
-        self.model = model
+        self.model = model or model_for_prompt.get(prompt_name, DEFAULT_MODEL)
         self.max_tokens = max_tokens
-        self.client = None
-
-    def _ensure_client(self) -> Anthropic:
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.batch = batch
+        self.poll_interval = poll_interval
+        self.batch_timeout = batch_timeout
+        self.max_input_chars = max_input_chars
+        self.client = client
+
+    def _ensure_client(self) -> AsyncAnthropic:
         """Ensure Anthropic client is initialized."""
         if self.client is None:
-            load_dotenv()
-            self.client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+            self.client = create_async_client()
         return self.client
 
-    def _load_videos_from_assess(self, target_date: date) -> list[MarkdownFile]:
+    async def _load_videos_from_assess(self, target_date: date) -> list[MarkdownFile]:
         """Load videos from assess stage that meet happiness threshold.
 
+        Scores come from the directory's Parquet snapshot, so only the files
+        of videos that pass the threshold are parsed, concurrently in worker
+        threads.
+
         Args:
             target_date: Date to load videos for
 
@@ -62,70 +124,163 @@ class EnhanceStage(Stage):
         """
         assess_dir = Path("stages") / "assess" / target_date.strftime("%Y-%m-%d")
 
-        if not assess_dir.exists():
-            return []
+        index = await asyncio.to_thread(Video.df_from_date_dir, assess_dir)
+        happy = index["happiness_score"] >= self.happiness_threshold
+        paths = [
+            assess_dir / f"video_{video_id}.md"
+            for video_id in index.loc[happy, "video_id"]
+        ]
+        loaded = await asyncio.gather(
+            *(asyncio.to_thread(MarkdownFile.load, md_path) for md_path in paths),
+            return_exceptions=True,
+        )
 
         videos = []
-        for md_path in sorted(assess_dir.glob("video_*.md")):
-            try:
-                md_file = MarkdownFile.load(md_path)
-                happiness_score = md_file.frontmatter.get("happiness_score", 0)
-
-                # Only include videos that meet threshold
-                if happiness_score >= self.happiness_threshold:
-                    videos.append(md_file)
-
-            except Exception as e:
-                console.print(
-                    f"[yellow]⚠ Error loading {md_path.name}: {str(e)}[/yellow]"
-                )
+        for md_path, md_file in zip(paths, loaded):
+            if isinstance(md_file, Exception):
+                logger.warning("Error loading %s: %s", md_path.name, md_file)
+                continue
+            videos.append(md_file)
 
         return videos
 
-    def _enhance_description_simple(self, title: str, description: str) -> str:
-        """Enhance a single video description using Claude.
+    @staticmethod
+    def _build_prompt(title: str, description: str) -> str:
+        """Build the enhancement prompt for one video.
 
         Args:
             title: Video title
             description: Original description
 
         Returns:
-            Enhanced description
+            Prompt text
+        """
+        return PROMPT_TEMPLATE.format(title=title, description=description)
+
+    def _prompt_input(self, description: str) -> str:
+        """Trim a description to what is worth sending to Claude.
+
+        Links are dropped and the rest is cut to max_input_chars; the prompt
+        asks for links and trailing boilerplate to be removed anyway.
+        """
+        description = _BLANK_LINES_RE.sub("\n\n", _URL_RE.sub("", description))
+        return description.strip()[: self.max_input_chars]
+
+    def _cache_key(self, title: str, description: str) -> str:
+        """Response cache key for one video's enhancement."""
+        return cache_key(
+            self.model,
+            self.prompt_name,
+            self.prompt_version,
+            [{"title": title, "description": self._prompt_input(description)}],
+        )
+
+    @staticmethod
+    def _description(video: MarkdownFile) -> str:
+        """Extract the description (everything after the title) from content."""
+        start = video.content.find("\n\n")
+        return video.content[start + 2 :] if start != -1 else ""
+
+    async def _enhance_descriptions_batch(
+        self, videos: list[MarkdownFile]
+    ) -> dict[str, str]:
+        """Enhance descriptions through the Message Batches API.
+
+        One request per distinct (title, description) is submitted in a single
+        batch; repeats (reposts, channel boilerplate) share its result and
+        prompts found in the response cache are not resubmitted.
+
+        Args:
+            videos: Videos to enhance
+
+        Returns:
+            Mapping of video_id to enhanced description; videos whose request
+            did not succeed are left out
         """
         client = self._ensure_client()
+        enhanced = {}  # cache key -> enhanced description
+        keys = {}  # video_id -> cache key
+        custom_id_keys = {}  # custom_id -> cache key
+        submitted = set()
+        requests = []
+        for video in videos:
+            video_id = str(video.frontmatter.get("video_id", ""))
+            title = video.frontmatter.get("title", "")
+            description = self._description(video)
+            key = keys[video_id] = self._cache_key(title, description)
+            if key in enhanced or key in submitted:
+                continue
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                message = Message.model_validate_json(cached)
+                enhanced[key] = message.content[0].text.strip()
+                continue
+            custom_id_keys[video_id] = key
+            submitted.add(key)
+            requests.append(
+                Request(
+                    custom_id=video_id,
+                    params=MessageCreateParamsNonStreaming(
+                        model=self.model,
+                        max_tokens=self.max_tokens,
+                        messages=[
+                            {
+                                "role": "user",
+                                "content": [
+                                    {
+                                        "type": "text",
+                                        "text": self._build_prompt(
+                                            title, self._prompt_input(description)
+                                        ),
+                                    }
+                                ],
+                            }
+                        ],
+                    ),
+                )
+            )
 
-        prompt = f"""Improve this YouTube video description by removing:
-- Clickbait language
-- "Like and subscribe" spam
-- Excessive links
-- Overly promotional content
-- Social media handles
+        if requests:
+            results = await run_batch(
+                client, requests, self.poll_interval, self.batch_timeout
+            )
+            for custom_id, message in results.items():
+                key = custom_id_keys[custom_id]
+                enhanced[key] = message.content[0].text.strip()
+                if self.cache is not None and is_cacheable(message):
+                    self.cache.set(key, message.model_dump_json())
 
-Keep the core information that describes what the video is about.
-Return ONLY the enhanced description, nothing else.
+        return {
+            video_id: enhanced[key] for video_id, key in keys.items() if key in enhanced
+        }
 
-Title: {title}
-Description: {description}
+    async def _enhance_description_simple(self, title: str, description: str) -> str:
+        """Enhance a single video description using Claude.
 
-Enhanced Description:"""
+        Args:
+            title: Video title
+            description: Original description
+
+        Returns:
+            Enhanced description
+        """
+        client = self._ensure_client()
+        prompt = self._build_prompt(title, self._prompt_input(description))
 
         try:
-            response = client.messages.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [{"type": "text", "text": prompt}],
-                    }
-                ],
-                max_tokens=self.max_tokens,
+            response = await aget_response(
+                client,
+                {"role": "user", "content": [{"type": "text", "text": prompt}]},
+                ClaudeConfig(self.model, self.max_tokens),
+                cache=self.cache,
+                key=self._cache_key(title, description),
             )
 
             enhanced = response.content[0].text if response.content else description
             return enhanced.strip()
 
         except Exception as e:
-            console.print(f"[yellow]⚠ Error enhancing description: {str(e)}[/yellow]")
+            logger.warning("Error enhancing description: %s", e)
             return description
 
     async def run(self, target_date: date) -> Dict[str, Any]:
@@ -137,6 +292,7 @@ Enhanced Description:"""
         Returns:
             Dictionary containing execution statistics
         """
+        owns_client = self.client is None
         stage_dir = self.ensure_stage_dir(target_date)
 
         console.print(
@@ -145,7 +301,7 @@ Enhanced Description:"""
 
         try:
             # Load videos from assess stage
-            videos = self._load_videos_from_assess(target_date)
+            videos = await self._load_videos_from_assess(target_date)
 
             if not videos:
                 console.print(
@@ -161,42 +317,67 @@ Enhanced Description:"""
             console.print(
                 f"[green]✓ Loaded {len(videos)} videos from assess stage (happiness >= {self.happiness_threshold})[/green]"
             )
+            # a missing API key fails here, not as one fallback per video
+            self._ensure_client()
 
-            # Enhance each video
+            # Enhance descriptions concurrently, bounded to respect rate limits,
+            # or all at once through a batch
             enhanced_count = 0
             errors = []
+            # the whole run is one enhancement, so all videos share a timestamp
+            enhanced_at = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            # videos with the same title and description share one request
+            enhancements: dict[str, asyncio.Task] = {}
+            batch_results = None
+            if self.batch:
+                console.print("[dim]Waiting for the Message Batch to finish...[/dim]")
+                batch_results = await self._enhance_descriptions_batch(videos)
 
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 console=console,
+                # per-item updates; a few redraws a second are plenty
+                refresh_per_second=4,
             ) as progress:
                 task = progress.add_task(
                     "Enhancing video descriptions...", total=len(videos)
                 )
 
-                for video in videos:
-                    try:
-                        video_id = video.frontmatter.get("video_id", "")
-                        title = video.frontmatter.get("title", "")
-
-                        # Extract description from content
-                        description = (
-                            video.content.split("\n\n", 1)[1]
-                            if "\n\n" in video.content
-                            else ""
+                async def enhance_limited(title: str, description: str) -> str:
+                    async with semaphore:
+                        return await self._enhance_description_simple(
+                            title, description
                         )
 
+                async def enhance_video(video: MarkdownFile) -> None:
+                    video_id = video.frontmatter.get("video_id", "")
+                    title = video.frontmatter.get("title", "")
+
+                    # Extract description from content
+                    description = self._description(video)
+
+                    try:
                         # Enhance description using Claude
-                        enhanced_description = self._enhance_description_simple(
-                            title, description
-                        )
+                        if batch_results is not None:
+                            # failed batch requests keep the original
+                            enhanced_description = batch_results.get(
+                                str(video_id), description
+                            )
+                        else:
+                            key = self._cache_key(title, description)
+                            if key not in enhancements:
+                                enhancements[key] = asyncio.ensure_future(
+                                    enhance_limited(title, description)
+                                )
+                            enhanced_description = await enhancements[key]
 
                         # Update frontmatter
                         video.update_frontmatter(
                             {
                                 "stage": "enhanced",
-                                "enhanced_at": datetime.utcnow().isoformat() + "Z",
+                                "enhanced_at": enhanced_at,
                                 "enhanced_description": enhanced_description,
                             }
                         )
@@ -205,16 +386,24 @@ Enhanced Description:"""
                         video.content = f"# {title}\n\n{enhanced_description}"
 
                         # Save to enhance stage
+                        # in a thread, so other requests keep going meanwhile
                         output_path = stage_dir / f"video_{video_id}.md"
-                        video.save(output_path)
-                        enhanced_count += 1
+                        await asyncio.to_thread(video.save, output_path)
+                    finally:
+                        progress.update(task, advance=1)
 
-                    except Exception as e:
-                        error_msg = f"Error enhancing video {video.frontmatter.get('video_id', 'unknown')}: {str(e)}"
-                        errors.append(error_msg)
-                        console.print(f"[red]✗ {error_msg}[/red]")
+                outcomes = await asyncio.gather(
+                    *(enhance_video(video) for video in videos),
+                    return_exceptions=True,
+                )
 
-                    progress.update(task, advance=1)
+            for video, outcome in zip(videos, outcomes):
+                if isinstance(outcome, Exception):
+                    error_msg = f"Error enhancing video {video.frontmatter.get('video_id', 'unknown')}: {str(outcome)}"
+                    errors.append(error_msg)
+                    logger.error(error_msg)
+                else:
+                    enhanced_count += 1
 
             if errors:
                 console.print(f"[yellow]⚠ Completed with {len(errors)} errors[/yellow]")
@@ -239,3 +428,8 @@ Enhanced Description:"""
                 "error_message": error_msg,
                 "date": target_date.strftime("%Y-%m-%d"),
             }
+        finally:
+            # the aiohttp session is bound to this event loop
+            if owns_client and self.client is not None:
+                await self.client.close()
+                self.client = None
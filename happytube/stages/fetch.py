@@ -1,16 +1,20 @@
 """Fetch stage - retrieves videos from YouTube."""
 
-from datetime import date, datetime
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, date, datetime
 from typing import Dict, Any
 
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from happytube.models.markdown import MarkdownFile
-from happytube.stages.base import Stage
+from happytube.stages.base import SAVE_WORKERS, Stage
+from happytube.utils.logging import get_logger
 from happytube.videos import Search
 
 console = Console()
+logger = get_logger(__name__)
 
 
 class FetchStage(Stage):
@@ -62,58 +66,68 @@ class FetchStage(Stage):
                 search.get()
                 progress.update(task, completed=True)
 
-            # Convert to DataFrame
-            videos_df = search.get_df()
+            # Convert to plain row dicts, limited to max_videos
+            videos = search.get_df().head(self.max_videos).to_dict(orient="records")
 
-            # Limit to max_videos
-            if len(videos_df) > self.max_videos:
-                videos_df = videos_df.head(self.max_videos)
-
-            console.print(f"[green]✓ Retrieved {len(videos_df)} videos[/green]")
+            console.print(f"[green]✓ Retrieved {len(videos)} videos[/green]")
 
             # Save each video as a markdown file
             saved_count = 0
             errors = []
+            # the whole run is one fetch, so all videos share a timestamp
+            fetched_at = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 console=console,
+                # per-item updates; a few redraws a second are plenty
+                refresh_per_second=4,
             ) as progress:
                 task = progress.add_task(
-                    f"Saving videos to {stage_dir}...", total=len(videos_df)
+                    f"Saving videos to {stage_dir}...", total=len(videos)
                 )
 
-                for _, row in videos_df.iterrows():
+                def save_one(row: dict) -> None:
+                    # Create frontmatter
+                    frontmatter = {
+                        "video_id": row["video_id"],
+                        "title": row["title"],
+                        "channel": row.get("channel_title", ""),
+                        "channel_id": row.get("channel_id", ""),
+                        "published_at": row.get("published_at", ""),
+                        "fetched_at": fetched_at,
+                        "stage": "fetched",
+                        "script_type": row.get("script", ""),
+                    }
+
+                    # Create content (title + description)
+                    content = f"# {row['title']}\n\n{row.get('description', '')}"
+
+                    # Save as markdown file
+                    md_file = MarkdownFile(frontmatter, content)
+                    output_path = stage_dir / f"video_{row['video_id']}.md"
+                    md_file.save(output_path)
+
+                loop = asyncio.get_running_loop()
+
+                async def save_in_thread(row: dict) -> None:
+                    nonlocal saved_count
                     try:
-                        # Create frontmatter
-                        frontmatter = {
-                            "video_id": row["video_id"],
-                            "title": row["title"],
-                            "channel": row.get("channel_title", ""),
-                            "channel_id": row.get("channel_id", ""),
-                            "published_at": row.get("published_at", ""),
-                            "fetched_at": datetime.utcnow().isoformat() + "Z",
-                            "stage": "fetched",
-                            "script_type": row.get("script", ""),
-                        }
-
-                        # Create content (title + description)
-                        content = f"# {row['title']}\n\n{row.get('description', '')}"
-
-                        # Save as markdown file
-                        md_file = MarkdownFile(frontmatter, content)
-                        output_path = stage_dir / f"video_{row['video_id']}.md"
-                        md_file.save(output_path)
+                        await loop.run_in_executor(executor, save_one, row)
                         saved_count += 1
-
                     except Exception as e:
                         error_msg = f"Error saving video {row.get('video_id', 'unknown')}: {str(e)}"
                         errors.append(error_msg)
-                        console.print(f"[red]✗ {error_msg}[/red]")
+                        logger.error(error_msg)
 
                     progress.update(task, advance=1)
 
+                # saves are independent file writes; the pool runs them while
+                # the event loop stays free
+                with ThreadPoolExecutor(max_workers=SAVE_WORKERS) as executor:
+                    await asyncio.gather(*(save_in_thread(row) for row in videos))
+
             if errors:
                 console.print(f"[yellow]⚠ Completed with {len(errors)} errors[/yellow]")
             else:
@@ -1,5 +1,6 @@
 """Report stage - generates HTML reports and exports analytics."""
 
+import asyncio
 from datetime import date
 from pathlib import Path
 from typing import Dict, Any, List
@@ -7,12 +8,22 @@ from typing import Dict, Any, List
 from jinja2 import Environment, FileSystemLoader
 from rich.console import Console
 
-from happytube.models.markdown import MarkdownFile
 from happytube.models.video import Video
 from happytube.stages.base import Stage
 
 console = Console()
 
+# the frontmatter fields daily_report.html renders
+REPORT_FIELDS = [
+    "video_id",
+    "title",
+    "channel",
+    "channel_id",
+    "happiness_score",
+    "happiness_reasoning",
+    "enhanced_description",
+]
+
 
 class ReportStage(Stage):
     """Generates daily HTML reports and exports analytics."""
@@ -27,46 +38,41 @@ class ReportStage(Stage):
         self.template_dir = template_dir
         # Create Jinja2 environment
         if template_dir.exists():
-            self.env = Environment(loader=FileSystemLoader(str(template_dir)))
+            # templates do not change while a run is in progress
+            self.env = Environment(
+                loader=FileSystemLoader(str(template_dir)), auto_reload=False
+            )
         else:
             self.env = None
 
-    def _load_enhanced_videos(self, target_date: date) -> List[Dict[str, Any]]:
+    async def _load_enhanced_videos(self, target_date: date) -> List[Dict[str, Any]]:
         """Load all enhanced videos for the target date.
 
+        Reads the frontmatter from the directory's Parquet snapshot (rebuilt
+        when a video file changes) instead of parsing every markdown file.
+
         Args:
             target_date: Date to load videos for
 
         Returns:
-            List of video dictionaries with frontmatter data
+            List of video dictionaries with the REPORT_FIELDS frontmatter
         """
         enhance_dir = Path("stages") / "enhance" / target_date.strftime("%Y-%m-%d")
 
-        if not enhance_dir.exists():
-            return []
-
-        videos = []
-        for md_path in sorted(enhance_dir.glob("video_*.md")):
-            try:
-                md_file = MarkdownFile.load(md_path)
-                # Combine frontmatter with content
-                video_data = md_file.frontmatter.copy()
-                video_data["content"] = md_file.content
-                videos.append(video_data)
-            except Exception as e:
-                console.print(
-                    f"[yellow]⚠ Error loading {md_path.name}: {str(e)}[/yellow]"
-                )
-
+        df = await asyncio.to_thread(Video.df_from_date_dir, enhance_dir)
+        df = df[REPORT_FIELDS]
         # Sort by happiness score (highest first)
-        videos.sort(key=lambda v: v.get("happiness_score", 0), reverse=True)
-
-        return videos
+        df = df.sort_values(
+            "happiness_score", ascending=False, kind="stable", na_position="last"
+        ).astype({"happiness_score": "Int64"})
+        # missing values as None so the template's truthiness checks still work
+        return df.astype(object).where(df.notna(), None).to_dict(orient="records")
 
     def _export_parquet(self, target_date: date, days_back: int = 7) -> None:
         """Export stage data to Parquet for analytics.
 
-        Uses the Video model's df_from_stage_dir and to_parquet methods.
+        Uses the Video model's df_from_stage_dir and to_parquet methods,
+        covering the days_back days up to target_date.
 
         Args:
             target_date: Target date
@@ -75,7 +81,10 @@ class ReportStage(Stage):
         for stage_name in ["fetch", "assess", "enhance"]:
             try:
                 # Use Video model's method to load data
-                df = Video.df_from_stage_dir(stage_name, days_back=days_back)
+                # the enhance frame for target_date is already in memory
+                df = Video.df_from_stage_dir(
+                    stage_name, days_back=days_back, end_date=target_date
+                )
 
                 if not df.empty:
                     output_dir = Path("parquet") / stage_name / "by-run-date"
@@ -110,7 +119,7 @@ class ReportStage(Stage):
 
         try:
             # Load enhanced videos
-            videos = self._load_enhanced_videos(target_date)
+            videos = await self._load_enhanced_videos(target_date)
 
             if not videos:
                 console.print("[yellow]⚠ No enhanced videos found[/yellow]")
@@ -124,9 +133,7 @@ class ReportStage(Stage):
 
             # Calculate statistics
             happiness_scores = [
-                v.get("happiness_score", 0)
-                for v in videos
-                if v.get("happiness_score", 0) > 0
+                v["happiness_score"] for v in videos if (v["happiness_score"] or 0) > 0
             ]
             avg_happiness = (
                 sum(happiness_scores) / len(happiness_scores) if happiness_scores else 0
@@ -5,6 +5,10 @@ import time
 from rich.live import Live
 from rich.table import Table
 
+QUEUE_SIZE = 100
+# how long a partial batch may wait for more items, in seconds
+BATCH_WAIT = 0.05
+
 
 async def fetch_videos(queue):
     i = 0
@@ -15,11 +19,23 @@ async def fetch_videos(queue):
         await asyncio.sleep(0.1)
 
 
-async def get_multiple_items(queue, num_items):
-    items = []
-    for _ in range(num_items):
-        item = await queue.get()
-        items.append(item)
+async def get_multiple_items(queue, num_items, max_wait=BATCH_WAIT):
+    """Wait for one item, then take up to num_items that arrive within max_wait."""
+    items = [await queue.get()]
+    deadline = asyncio.get_running_loop().time() + max_wait
+    while len(items) < num_items:
+        try:
+            items.append(queue.get_nowait())
+            continue
+        except asyncio.QueueEmpty:
+            pass
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            break
+        try:
+            items.append(await asyncio.wait_for(queue.get(), remaining))
+        except TimeoutError:
+            break
     return items
 
 
@@ -58,18 +74,17 @@ def signal_handler(loop):
 
 async def main():
     # config_queue = asyncio.Queue()
-    queue1 = asyncio.Queue()
-    queue2 = asyncio.Queue()
-    await asyncio.gather(
-        queue_info(queue1, queue2),
-        fetch_videos(queue1),
-    )
-    await asyncio.sleep(5)  # Delay for 5 seconds
-
-    await asyncio.gather(
-        measure_happiness(queue1, queue2),
-        improve_descriptions(queue2),
-    )
+    # bounded, so fetching pauses when the later stages fall behind
+    queue1 = asyncio.Queue(maxsize=QUEUE_SIZE)
+    queue2 = asyncio.Queue(maxsize=QUEUE_SIZE)
+    # all stages run side by side; each of them loops forever
+    tasks = [
+        asyncio.create_task(fetch_videos(queue1)),
+        asyncio.create_task(measure_happiness(queue1, queue2)),
+        asyncio.create_task(improve_descriptions(queue2)),
+        asyncio.create_task(queue_info(queue1, queue2)),
+    ]
+    await asyncio.gather(*tasks)
 
 
 if __name__ == "__main__":
@@ -2,7 +2,16 @@
 
 import html
 import unicodedata
-from collections import Counter
+from functools import cache
+
+# only the first few characters of a title decide its script
+SCRIPT_PREFIX = 10
+
+
+@cache
+def _script_of(cp: int) -> str:
+    """First word of the code point's Unicode name, e.g. LATIN or CYRILLIC."""
+    return unicodedata.name(chr(cp), "").split(" ", 1)[0]
 
 
 def determine_text_script(text: str) -> str:
@@ -10,17 +19,20 @@ def determine_text_script(text: str) -> str:
     Determine the script of the text.
     """
     text = html.unescape(text)
-    beginning = text[:10]
-    script_counter = Counter()
+    beginning = text[:SCRIPT_PREFIX]
+    # a plain dict beats Counter for a handful of characters
+    script_counts: dict[str, int] = {}
     for char in beginning:
         if char.isalpha():  # Check only alphabetic characters
-            script = unicodedata.name(char).split()[0]
-            script_counter[script] += 1
-    most_common = script_counter.most_common(1)
-    num_occurrences = most_common[0][1] if most_common else 0
-    if num_occurrences / len(beginning) < 0.5:
+            script = _script_of(ord(char))
+            script_counts[script] = script_counts.get(script, 0) + 1
+    if not script_counts:
+        return "MIXED"
+    # max() keeps the first script seen on ties, like Counter.most_common
+    script = max(script_counts, key=script_counts.__getitem__)
+    if script_counts[script] / len(beginning) < 0.5:
         return "MIXED"
-    return most_common[0][0]
+    return script
 
 
 __all__ = ["determine_text_script"]
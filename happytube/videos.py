@@ -6,12 +6,45 @@ import os
 import re
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from typing import ClassVar
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from happytube.utils import determine_text_script
 
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# (connect, read) seconds for YouTube API calls
+REQUEST_TIMEOUT = (5, 30)
+SEARCH_FIELDS = (
+    "items(id/videoId,snippet(publishedAt,channelId,title,description,"
+    "thumbnails/high/url,channelTitle))"
+)
+
+
+def create_session() -> requests.Session:
+    """Create a pooled session that retries transient YouTube API errors."""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # hand the last error response back so get() can log its status
+        raise_on_status=False,
+    )
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry),
+    )
+    return session
+
 
 @dataclass
 class YtQuery:
@@ -21,6 +54,8 @@ class YtQuery:
     data: list = field(default_factory=list)
     variant: str = "def"
     key: str | None = None
+    # shared so repeated queries reuse the keep-alive connection
+    _session: ClassVar[requests.Session] = create_session()
 
     def __post_init__(self):
         if self.key is None:
@@ -28,9 +63,16 @@ class YtQuery:
         self.params["key"] = self.key
 
     def get(self):
-        response = requests.get(self.url, params=self.params)
+        response = self._session.get(
+            self.url, params=self.params, timeout=REQUEST_TIMEOUT
+        )
         if response.status_code == 200:
-            self.data = response.json()["items"]
+            payload = (
+                orjson.loads(response.content)
+                if orjson is not None
+                else response.json()
+            )
+            self.data = payload["items"]
         else:
             logging.error(f"Error: {response.status_code}")
 
@@ -39,8 +81,12 @@ class YtQuery:
         dir = f"data/fetched/{self.name}"
         os.makedirs(dir, exist_ok=True)
         file_path = f"{dir}/{current_time}_{self.variant}.json"
-        with open(file_path, "w") as f:
-            json.dump(self.data, f, indent=4)
+        if orjson is not None:
+            with open(file_path, "wb") as f:
+                f.write(orjson.dumps(self.data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
         return file_path
 
     def set_param(self, key, value):
@@ -65,6 +111,8 @@ class Search(YtQuery):
             "videoDuration": "medium",  # "short", "medium", "long"
             "videoDimension": "2d",  # "3d", "any"
             "videoCategoryId": 15,
+            # partial response: only the fields get_df and the exports read
+            "fields": SEARCH_FIELDS,
         }
 
     def get_df(self):
@@ -73,7 +121,7 @@ class Search(YtQuery):
         out = data.assign(
             original_title=lambda x: x["title"],
             title=lambda x: x["title"].map(html.unescape),
-            script=data["title"].apply(determine_text_script),
+            script=data["title"].map(determine_text_script),
         )
 
         # ['publishedAt', 'channelId', 'title', 'description', 'thumbnails','channelTitle', 'liveBroadcastContent', 'publishTime', 'video_id']
@@ -90,10 +138,18 @@ class Search(YtQuery):
             ]
         ]
 
+    def _iter_search_records(self):
+        for row in self.data:
+            snippet = row["snippet"]
+            yield {
+                "video_id": row["id"]["videoId"],
+                "title": html.unescape(snippet["title"]),
+                "description": snippet["description"],
+            }
+
     def get_list_for_claude(self):
-        return self.get_df()[["video_id", "title", "description"]].to_dict(
-            orient="records"
-        )
+        # no DataFrame needed for three plain columns
+        return list(self._iter_search_records())
 
     def get_csv(self, colummn_list: list | None = None):
         colummn_list = colummn_list or ["video_id", "title", "description"]
@@ -122,6 +178,11 @@ def get_search_data(row):
     return out
 
 
+_CAMEL_WORD = re.compile("(.)([A-Z][a-z]+)")
+_CAMEL_BOUNDARY = re.compile("([a-z0-9])([A-Z])")
+
+
+@lru_cache(maxsize=256)
 def camel_to_snake(name):
-    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
-    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+    s1 = _CAMEL_WORD.sub(r"\1_\2", name)
+    return _CAMEL_BOUNDARY.sub(r"\1_\2", s1).lower()
@@ -6,92 +6,256 @@ it to a static JSON file that can be served from GitHub Pages or other
 static hosting services.
 """
 
+import argparse
 import json
 import logging
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, NamedTuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional, for streaming very large files
+    ijson = None
+
+# what earlier exports extracted per file; kept with the other caches, not
+# next to the published videos.json
+INDEX_PATH = Path(".cache") / "export" / "videos.index.json"
+
+# JSON arrays at least this big are streamed item by item (needs ijson)
+STREAM_MIN_BYTES = 4_000_000
+
+# shared stand-in for missing nested objects; never mutated
+_EMPTY: dict = {}
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def extract_video_info(item: dict) -> dict | None:
+def read_json(path: str | Path) -> Any:
+    """Parse a JSON file, with orjson when installed."""
+    # one binary read; both parsers take UTF-8 bytes without a text layer
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def iter_json_items(path: str | Path) -> Iterator[Any]:
+    """Yield the items of a JSON array file, or the file's single value.
+
+    Arrays of at least STREAM_MIN_BYTES are streamed with ijson when it is
+    installed, so a big shard is never held in memory as a whole.
+    """
+    if ijson is not None and os.path.getsize(path) >= STREAM_MIN_BYTES:
+        with open(path, "rb") as f:
+            if f.read(64).lstrip()[:1] == b"[":
+                f.seek(0)
+                yield from ijson.items(f, "item", use_float=True)
+                return
+    data = read_json(path)
+    yield from data if isinstance(data, list) else [data]
+
+
+def iter_json_files(root: str | Path) -> Iterator[str]:
+    """Yield the paths of all .json files under root, as strings.
+
+    os.scandir reports entry types from the directory listing itself, so
+    unlike Path.glob("**/*.json") this needs no stat() or Path per entry.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".json"):
+                    yield entry.path
+
+
+def write_json_array(items: Iterable[Any], output_path: Path) -> None:
+    """Write items as a JSON array, serializing one element at a time.
+
+    Only one element's JSON is held in memory at once, rather than the
+    whole pretty-printed document.
+    """
+    with open(output_path, "wb") as f:
+        f.write(b"[")
+        separator = b"\n"
+        for item in items:
+            f.write(separator)
+            separator = b",\n"
+            if orjson is not None:
+                f.write(orjson.dumps(item, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(json.dumps(item, indent=2, ensure_ascii=False).encode())
+        f.write(b"]\n" if separator == b"\n" else b"\n]\n")
+
+
+class VideoInfo(NamedTuple):
+    """The fields of one video shown by the player."""
+
+    video_id: str
+    title: str
+    description: str
+    channel_title: str
+    thumbnail: str
+    published_at: str
+
+
+def write_json_columns(videos: list[VideoInfo], output_path: Path) -> None:
+    """Write videos as one JSON object of columns, e.g. {"title": [...], ...}.
+
+    Each field name is written once instead of once per video, which keeps
+    the file small and lets the player scan a single column when searching.
+    """
+    columns = {field: [] for field in VideoInfo._fields}
+    for field, values in zip(VideoInfo._fields, zip(*videos)):
+        columns[field] = list(values)
+    with open(output_path, "wb") as f:
+        if orjson is not None:
+            f.write(orjson.dumps(columns))
+        else:
+            f.write(json.dumps(columns, ensure_ascii=False).encode())
+        f.write(b"\n")
+
+
+def extract_video_info(item: dict) -> VideoInfo | None:
     """Extract video information from YouTube API response."""
     try:
         # Handle both search results and video details format
-        if "id" in item:
-            video_id = (
-                item["id"].get("videoId")
-                if isinstance(item["id"], dict)
-                else item["id"]
-            )
-        else:
+        if "id" not in item:
             return None
+        video_id = item["id"]
+        if isinstance(video_id, dict):
+            video_id = video_id.get("videoId")
+
+        snippet = item.get("snippet") or _EMPTY
+        thumbs = (snippet.get("thumbnails") or _EMPTY).get("high") or _EMPTY
 
-        snippet = item.get("snippet", {})
-
-        return {
-            "video_id": video_id,
-            "title": snippet.get("title", "Unknown Title"),
-            "description": snippet.get("description", ""),
-            "channel_title": snippet.get("channelTitle", ""),
-            "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
-            "published_at": snippet.get("publishedAt", ""),
-        }
-    except Exception as e:
-        logger.warning(f"Error extracting video info: {e}")
+        return VideoInfo(
+            video_id=video_id,
+            title=snippet.get("title", "Unknown Title"),
+            description=snippet.get("description", ""),
+            channel_title=snippet.get("channelTitle", ""),
+            thumbnail=thumbs.get("url", ""),
+            published_at=snippet.get("publishedAt", ""),
+        )
+    except (AttributeError, KeyError, TypeError) as e:
+        # malformed item, e.g. a snippet that is not an object
+        logger.warning("Error extracting video info: %s", e)
         return None
 
 
-def load_videos_from_data_dir(data_dir: Path) -> List[Dict[str, Any]]:
+def read_index(index_path: Path | None) -> dict[str, Any]:
+    """Read the export index, or return an empty one if it is missing or broken."""
+    if index_path is None:
+        return {}
+    try:
+        index = read_json(index_path)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def write_index(index: dict[str, Any], index_path: Path) -> None:
+    """Write the export index compactly."""
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(index_path, "wb") as f:
+        if orjson is not None:
+            f.write(orjson.dumps(index))
+        else:
+            f.write(json.dumps(index, ensure_ascii=False).encode())
+
+
+def load_videos_from_data_dir(
+    data_dir: Path, index_path: Path | None = None
+) -> list[VideoInfo]:
     """
     Load video data from the HappyTube data directory.
 
     Args:
         data_dir: Path to the data/fetched directory
+        index_path: Optional index of already extracted videos, keyed by file
+            path, mtime and size; unchanged files are not parsed again
 
     Returns:
-        List of video dictionaries
+        List of videos, converted to dicts only when written out
     """
-    videos = []
-    seen_ids = set()
+    # first occurrence of each video_id wins; dicts keep insertion order
+    videos_by_id = {}
 
     if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return videos
+        logger.warning("Data directory not found: %s", data_dir)
+        return []
 
     # Look for JSON files in the data directory
-    video_files = list(data_dir.glob("**/*.json"))
-    logger.info(f"Found {len(video_files)} JSON files to process")
+    video_files = list(iter_json_files(data_dir))
+    logger.info("Found %d JSON files to process", len(video_files))
 
-    for video_file in video_files:
-        try:
-            with open(video_file, "r") as f:
-                data = json.load(f)
+    index = read_index(index_path)
+    # rebuilt from scratch, so deleted files drop out of the index
+    new_index = {}
 
-                # Handle both list and single item formats
-                items = data if isinstance(data, list) else [data]
+    def load_one(video_file: str) -> tuple[str, list | None, list[VideoInfo]]:
+        # extract in the worker, so only the small VideoInfo tuples outlive the file
+        name = os.path.relpath(video_file, data_dir)
+        try:
+            st = os.stat(video_file)
+            stamp = [st.st_mtime_ns, st.st_size]
+            cached = index.get(name)
+            if cached and cached[0] == stamp:
+                return name, stamp, [VideoInfo(*row) for row in cached[1]]
+            return (
+                name,
+                stamp,
+                [
+                    video_info
+                    for item in iter_json_items(video_file)
+                    if (video_info := extract_video_info(item))
+                ],
+            )
+        except Exception as e:
+            logger.warning("Error loading %s: %s", video_file, e)
+            # not indexed, so the file is retried next time
+            return name, None, []
 
-                for item in items:
-                    video_info = extract_video_info(item)
-                    if video_info and video_info["video_id"] not in seen_ids:
-                        videos.append(video_info)
-                        seen_ids.add(video_info["video_id"])
+    # reading and parsing files is independent per file; merge in file order
+    with ThreadPoolExecutor(max_workers=min(32, len(video_files)) or 1) as executor:
+        for name, stamp, file_videos in executor.map(load_one, video_files):
+            if stamp is not None:
+                new_index[name] = [stamp, [list(v) for v in file_videos]]
+            for video_info in file_videos:
+                videos_by_id.setdefault(video_info.video_id, video_info)
 
-        except Exception as e:
-            logger.warning(f"Error loading {video_file}: {e}")
+    if index_path is not None and new_index != index:
+        write_index(new_index, index_path)
 
-    logger.info(f"Loaded {len(videos)} unique videos")
-    return videos
+    logger.info("Loaded %d unique videos", len(videos_by_id))
+    return list(videos_by_id.values())
 
 
-def export_to_static(output_path: Path, data_dir: Path | None = None) -> None:
+def export_to_static(
+    output_path: Path,
+    data_dir: Path | None = None,
+    columnar: bool = True,
+    index_path: Path | None = INDEX_PATH,
+) -> None:
     """
     Export videos to a static JSON file for deployment.
 
     Args:
         output_path: Path where the videos.json file should be written
         data_dir: Path to the data/fetched directory (auto-detected if None)
+        columnar: Write an object of columns; False writes the older array
+            of video objects
+        index_path: Index of videos extracted by earlier exports (None to
+            parse every file)
     """
     # Auto-detect data directory if not provided
     if data_dir is None:
@@ -99,8 +263,11 @@ def export_to_static(output_path: Path, data_dir: Path | None = None) -> None:
         project_root = Path(__file__).parent.parent.parent
         data_dir = project_root / "data" / "fetched"
 
-    # Load videos
-    videos = load_videos_from_data_dir(data_dir)
+    # Ensure output directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Load videos, reusing what the last export extracted from unchanged files
+    videos = load_videos_from_data_dir(data_dir, index_path)
 
     if not videos:
         logger.warning("No videos found to export!")
@@ -110,26 +277,35 @@ def export_to_static(output_path: Path, data_dir: Path | None = None) -> None:
         # Create empty file for consistency
         videos = []
 
-    # Ensure output directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
     # Write to JSON file
-    with open(output_path, "w") as f:
-        json.dump(videos, f, indent=2)
+    if columnar:
+        write_json_columns(videos, output_path)
+    else:
+        write_json_array((video._asdict() for video in videos), output_path)
 
-    logger.info(f"Exported {len(videos)} videos to {output_path}")
+    logger.info("Exported %d videos to %s", len(videos), output_path)
 
 
 def main():
     """Main export function - run this to generate static build."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--legacy-aos",
+        action="store_true",
+        help="write an array of video objects instead of columns",
+    )
+    args = parser.parse_args()
+    # configured here rather than at import, so importers keep their levels
+    logging.basicConfig(level=logging.INFO)
+
     # Determine paths
     script_dir = Path(__file__).parent
     output_file = script_dir / "static" / "videos.json"
 
     logger.info("Starting HappyTube static export...")
-    export_to_static(output_file)
+    export_to_static(output_file, columnar=not args.legacy_aos)
     logger.info("Export complete!")
-    logger.info(f"Static files ready for deployment in: {script_dir / 'static'}")
+    logger.info("Static files ready for deployment in: %s", script_dir / "static")
 
 
 if __name__ == "__main__":
@@ -3,46 +3,110 @@ Simple Flask server for HappyTube video player.
 Serves curated YouTube videos with controlled playback interface.
 """
 
-import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from flask import Flask, jsonify, render_template
 
+from happytube.web.export import iter_json_files, read_json
+
 app = Flask(__name__)
+logger = logging.getLogger(__name__)
+
+# fetched YouTube responses, in the project root
+DATA_DIR = Path(__file__).parent.parent.parent / "data" / "fetched"
+
+# written by happytube.web.export
+EXPORTED_VIDEOS = Path(__file__).parent / "static" / "videos.json"
+
+# request threads when serving with waitress
+SERVER_THREADS = 8
+
+# (files signature, videos, videos by id) from the last load_video_data() scan
+_cache = None
+
+
+def read_exported_videos():
+    """Read the videos written by the static export, or None if unreadable.
+
+    The export may be an object of columns or an array of video objects.
+    """
+    try:
+        data = read_json(EXPORTED_VIDEOS)
+    except (OSError, ValueError):
+        return None
+    if isinstance(data, dict):
+        data = [dict(zip(data, row)) for row in zip(*data.values())]
+    return data
 
 
 def load_video_data():
     """
     Load video data from the HappyTube data directory.
     Returns a list of videos with happiness scores >= 3.
-    """
-    # This is a placeholder - we'll need to adapt based on actual data structure
-    # For now, return sample data structure
-    videos = []
 
-    # Try to load from data directory if it exists
-    data_dir = Path(__file__).parent.parent.parent / "data" / "fetched"
-
-    if data_dir.exists():
-        # Look for video JSON files
-        video_files = list(data_dir.glob("**/*.json"))
+    The parsed list is cached until a JSON file is added, removed or modified.
+    If static/videos.json was exported after the newest fetched file, it is
+    read instead of the fetched files.
+    """
+    global _cache
+    # Look for video JSON files
+    video_files = list(iter_json_files(DATA_DIR)) if DATA_DIR.exists() else []
+    newest = max((os.stat(p).st_mtime_ns for p in video_files), default=0)
+    try:
+        exported_at = os.stat(EXPORTED_VIDEOS).st_mtime_ns
+    except OSError:
+        exported_at = None
+    signature = (len(video_files), newest, exported_at)
+    if _cache is not None and _cache[0] == signature:
+        return _cache[1]
+
+    # a current export is one file to parse instead of every fetched one
+    exported = None
+    if exported_at is not None and exported_at >= newest:
+        exported = read_exported_videos()
+
+    by_id = {}
+    if exported:
+        for video in exported:
+            by_id.setdefault(video["video_id"], video)
+    else:
 
-        for video_file in video_files:
+        def load_one(video_file):
             try:
-                with open(video_file, "r") as f:
-                    data = json.load(f)
-                    # Adapt to YouTube API response format
-                    if isinstance(data, list):
-                        for item in data:
-                            video_info = extract_video_info(item)
-                            if video_info:
-                                videos.append(video_info)
+                return read_json(video_file)
             except Exception as e:
-                print(f"Error loading {video_file}: {e}")
+                logger.warning("Error loading %s: %s", video_file, e)
+                return None
+
+        # files are read and parsed in threads, then merged in order;
+        # the first occurrence of each video_id wins
+        with ThreadPoolExecutor(max_workers=min(32, len(video_files)) or 1) as executor:
+            for data in executor.map(load_one, video_files):
+                # Adapt to YouTube API response format
+                if isinstance(data, list):
+                    for item in data:
+                        video_info = extract_video_info(item)
+                        if video_info:
+                            by_id.setdefault(video_info["video_id"], video_info)
+
+    videos = list(by_id.values())
+    # one assignment, so concurrent requests never see half an update
+    _cache = (signature, videos, by_id)
 
     return videos
 
 
+def find_video(video_id):
+    """Look up one video by id in the cached video data."""
+    videos = load_video_data()
+    if _cache is not None and _cache[1] is videos:
+        return _cache[2].get(video_id)
+    return next((v for v in videos if v["video_id"] == video_id), None)
+
+
 def extract_video_info(item):
     """Extract video information from YouTube API response."""
     try:
@@ -67,7 +131,7 @@ def extract_video_info(item):
             "published_at": snippet.get("publishedAt", ""),
         }
     except Exception as e:
-        print(f"Error extracting video info: {e}")
+        logger.warning("Error extracting video info: %s", e)
         return None
 
 
@@ -87,8 +151,7 @@ def get_videos():
 @app.route("/api/videos/<video_id>")
 def get_video(video_id):
     """Get details for a specific video."""
-    videos = load_video_data()
-    video = next((v for v in videos if v["video_id"] == video_id), None)
+    video = find_video(video_id)
 
     if video:
         return jsonify(video)
@@ -96,9 +159,29 @@ def get_video(video_id):
         return jsonify({"error": "Video not found"}), 404
 
 
-def run_server(host="127.0.0.1", port=5000, debug=True):
-    """Run the Flask development server."""
-    app.run(host=host, port=port, debug=debug)
+def run_server(host="127.0.0.1", port=5000, debug=None):
+    """Run the server.
+
+    Debug mode (the default; set HAPPYTUBE_WEB_DEBUG=0 to turn it off) uses
+    Flask's reloading development server. Otherwise the video data is parsed
+    once up front and served by waitress with SERVER_THREADS threads, or by
+    Flask's threaded server if waitress is not installed.
+    """
+    if debug is None:
+        debug = os.environ.get("HAPPYTUBE_WEB_DEBUG", "1") != "0"
+    if debug:
+        app.run(host=host, port=port, debug=True)
+        return
+
+    # warm the cache, so the first request does not pay for the parse
+    load_video_data()
+    try:
+        from waitress import serve
+    except ImportError:
+        logger.warning("waitress is not installed; using Flask's threaded server")
+        app.run(host=host, port=port, debug=False, threaded=True)
+    else:
+        serve(app, host=host, port=port, threads=SERVER_THREADS)
 
 
 if __name__ == "__main__":
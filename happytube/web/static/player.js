@@ -30,7 +30,7 @@ async function loadVideos() {
             response = await fetch('videos.json');
         }
 
-        videos = await response.json();
+        videos = toVideoList(await response.json());
         filteredVideos = [...videos];
 
         if (videos.length > 0) {
@@ -47,6 +47,19 @@ async function loadVideos() {
     }
 }
 
+/**
+ * Turn the exported columns ({title: [...], ...}) into video objects;
+ * arrays (the Flask API, older exports) are returned unchanged
+ */
+function toVideoList(data) {
+    if (Array.isArray(data)) return data;
+    const fields = Object.keys(data);
+    const count = fields.length ? data[fields[0]].length : 0;
+    return Array.from({ length: count }, (_, i) =>
+        Object.fromEntries(fields.map(field => [field, data[field][i]]))
+    );
+}
+
 /**
  * Initialize the YouTube player with restricted parameters
  */
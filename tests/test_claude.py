@@ -0,0 +1,309 @@
+"""Tests for the Claude API helpers (without actual API calls)."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from anthropic.types import Message
+
+from happytube.claude import (
+    create_client,
+    default_settings,
+    do_with_videos,
+    dumps_videos,
+    get_client,
+    get_response,
+    range_video_happiness,
+    read_csv_response,
+    run_batch,
+    stream_response_lines,
+    write_csv_for_claude,
+)
+from happytube.claude_cache import MemoryCache, SqliteCache, cache_key
+from happytube.prompts import prompt_definitions
+
+
+def make_message(text, stop_reason="end_turn"):
+    return Message.model_validate(
+        {
+            "id": "msg_1",
+            "type": "message",
+            "role": "assistant",
+            "model": "claude-haiku-4-5",
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": stop_reason,
+            "usage": {"input_tokens": 1, "output_tokens": 1},
+        }
+    )
+
+
+class FakeBatches:
+    """Minimal stand-in for AsyncAnthropic.messages.batches."""
+
+    def __init__(self, status="ended"):
+        self.status = status
+        self.created = None
+        self.retrieved = 0
+        self.canceled = None
+
+    async def create(self, requests):
+        self.created = requests
+        return SimpleNamespace(id="batch_1", processing_status="in_progress")
+
+    async def retrieve(self, batch_id):
+        self.retrieved += 1
+        return SimpleNamespace(id=batch_id, processing_status=self.status)
+
+    async def cancel(self, batch_id):
+        self.canceled = batch_id
+
+    async def results(self, batch_id):
+        async def entries():
+            for request in self.created:
+                custom_id = request["custom_id"]
+                if custom_id == "broken":
+                    result = SimpleNamespace(type="errored")
+                else:
+                    message = make_message(f"id,happiness\n{custom_id},4\n")
+                    result = SimpleNamespace(type="succeeded", message=message)
+                yield SimpleNamespace(custom_id=custom_id, result=result)
+
+        return entries()
+
+
+def make_client(status="ended"):
+    return SimpleNamespace(messages=SimpleNamespace(batches=FakeBatches(status)))
+
+
+class TestRunBatch:
+    """Test the Message Batches API path."""
+
+    def test_results_are_keyed_by_custom_id(self):
+        client = make_client()
+        requests = [{"custom_id": "a"}, {"custom_id": "broken"}, {"custom_id": "b"}]
+
+        results = asyncio.run(run_batch(client, requests, poll_interval=0))
+
+        assert client.messages.batches.retrieved == 1
+        assert list(results) == ["a", "b"]
+        assert results["b"].content[0].text == "id,happiness\nb,4\n"
+
+    def test_batch_is_canceled_after_the_timeout(self):
+        client = make_client(status="in_progress")
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(
+                run_batch(client, [{"custom_id": "a"}], poll_interval=0, timeout=0)
+            )
+
+        assert client.messages.batches.canceled == "batch_1"
+
+    def test_do_with_videos_stays_synchronous(self):
+        client = make_client()
+        client.messages.create = CountingMessages().create
+        videos = [{"video_id": str(i)} for i in range(12)]
+
+        message = do_with_videos(client, videos, prompt_definitions)
+
+        assert message.content[0].text == "id,happiness\na,5\n"
+        assert client.messages.batches.created is None
+
+
+class TestPromptCaching:
+    """Test that the static prompt is marked for caching."""
+
+    def test_prompt_block_comes_first_and_is_cached(self):
+        message = range_video_happiness(
+            None, [{"video_id": "a"}], prompt_definitions, debug=True
+        )
+
+        prompt, videos = message["content"]
+        assert prompt["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in videos
+
+    def test_duplicate_videos_are_sent_once(self):
+        videos = [{"video_id": "b"}, {"video_id": "a"}, {"video_id": "b"}]
+
+        message = range_video_happiness(None, videos, prompt_definitions, debug=True)
+
+        assert json.loads(message["content"][1]["text"]) == [
+            {"video_id": "a"},
+            {"video_id": "b"},
+        ]
+
+    def test_cache_ttl(self):
+        message = range_video_happiness(
+            None, [], prompt_definitions, debug=True, cache_ttl="1h"
+        )
+
+        assert message["content"][0]["cache_control"]["ttl"] == "1h"
+
+
+class TestModelRouting:
+    """Test the per-prompt default model selection."""
+
+    def test_rating_defaults_to_haiku(self):
+        assert default_settings("rate_video_happiness").claude_model_version == (
+            "claude-haiku-4-5"
+        )
+
+    def test_description_uses_haiku(self):
+        settings = default_settings("make_description_meaningful")
+        assert settings.claude_model_version.startswith("claude-haiku")
+
+    def test_defaults_are_shared_frozen_instances(self):
+        settings = default_settings("rate_video_happiness")
+
+        assert settings is default_settings("rate_video_happiness")
+        with pytest.raises(AttributeError):
+            settings.claude_max_tokens = 1
+
+    def test_unknown_prompt_falls_back_to_default(self):
+        assert default_settings("other").claude_model_version == "claude-haiku-4-5"
+
+
+class CountingMessages:
+    """Stand-in for client.messages that counts create() calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, model, messages, max_tokens):
+        self.calls += 1
+        return make_message("id,happiness\na,5\n")
+
+
+def test_create_client_reuses_the_shared_client(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    get_client.cache_clear()
+    try:
+        assert create_client() is create_client()
+        assert create_client() is get_client()
+    finally:
+        get_client.cache_clear()
+
+
+class TestResponseCache:
+    """Test the local Claude response cache."""
+
+    def test_key_ignores_video_order(self):
+        a, b = {"video_id": "a"}, {"video_id": "b"}
+        assert cache_key("m", "p", 2, [a, b]) == cache_key("m", "p", 2, [b, a])
+        assert cache_key("m", "p", 2, [a]) != cache_key("m", "p", 1, [a])
+
+    def test_second_call_is_served_from_cache(self):
+        client = SimpleNamespace(messages=CountingMessages())
+        cache = MemoryCache()
+
+        first = get_response(client, {}, cache=cache, key="k")
+        second = get_response(client, {}, cache=cache, key="k")
+
+        assert client.messages.calls == 1
+        assert second.content[0].text == first.content[0].text
+
+    def test_sqlite_cache_roundtrip_and_expiry(self, tmp_path):
+        cache = SqliteCache(tmp_path / "cache.sqlite")
+        cache.set("fresh", "value")
+        cache.set("stale", "value", ttl=-1)
+
+        reopened = SqliteCache(tmp_path / "cache.sqlite")
+        assert reopened.get("fresh") == "value"
+        assert reopened.get("stale") is None
+        assert reopened.get("missing") is None
+
+        reopened.set("other", "value")
+        (count,) = reopened._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        assert count == 2
+
+    def test_truncated_responses_are_not_cached(self):
+        truncated = make_message("id,happiness\na,", stop_reason="max_tokens")
+        client = SimpleNamespace(
+            messages=SimpleNamespace(create=lambda **kwargs: truncated)
+        )
+        cache = MemoryCache()
+
+        assert get_response(client, {}, cache=cache, key="k") is truncated
+        assert cache.get("k") is None
+
+
+class TestReadCsvResponse:
+    """Test parsing Claude's CSV answers."""
+
+    def test_quoted_multiline_values(self):
+        df = read_csv_response(
+            'id,language,description_improved\na,en,"two\nlines"\nb,en,"one"\n'
+        )
+
+        assert df["id"].tolist() == ["a", "b"]
+        assert df["description_improved"][0] == "two\nlines"
+
+    def test_malformed_rows_are_skipped(self):
+        df = read_csv_response("id,happiness\na,4\nb,5,extra\nc,3\n")
+
+        assert df["id"].tolist() == ["a", "c"]
+        assert df.loc[df["happiness"] >= 4, "id"].tolist() == ["a"]
+
+    def test_blank_answer_gives_empty_frame(self):
+        df = read_csv_response("\n", ["id", "happiness"])
+
+        assert df.empty
+        assert df.columns.tolist() == ["id", "happiness"]
+
+    def test_csv_roundtrip(self):
+        df = pd.DataFrame({"video_id": ["a"], "description": ['say "hi"\nnow']})
+
+        text = write_csv_for_claude(df)
+
+        assert text.startswith('"video_id","description"')
+        assert read_csv_response(text)["description"][0] == 'say "hi"\nnow'
+
+
+def test_dumps_videos_is_compact_json():
+    videos = [{"video_id": "a", "title": "Příliš žluťoučký"}]
+
+    text = dumps_videos(videos)
+
+    assert " " not in text.replace("Příliš žluťoučký", "")
+    assert json.loads(text) == videos
+
+
+class FakeStream:
+    """Context manager mimicking client.messages.stream()."""
+
+    def __init__(self, chunks):
+        self.text_stream = iter(chunks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class TestStreaming:
+    """Test incremental parsing of streamed answers."""
+
+    def make_client(self, chunks):
+        return SimpleNamespace(
+            messages=SimpleNamespace(stream=lambda **kwargs: FakeStream(chunks))
+        )
+
+    def test_lines_are_yielded_when_complete(self):
+        client = self.make_client(["id,happ", "iness\na,", "4\nb,5"])
+
+        lines = stream_response_lines(client, {})
+
+        assert next(lines) == "id,happiness\n"
+        assert list(lines) == ["a,4\n", "b,5"]
+
+    def test_range_video_happiness_streams_rows(self):
+        client = self.make_client(['id,happiness\n"a"', ",4\n", "b,5\n"])
+
+        rows = range_video_happiness(client, [], prompt_definitions, stream=True)
+
+        assert list(rows) == [
+            {"id": "a", "happiness": "4"},
+            {"id": "b", "happiness": "5"},
+        ]
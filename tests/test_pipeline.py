@@ -1,13 +1,37 @@
 """Integration tests for the HappyTube pipeline."""
 
+import asyncio
+import csv
+import io
+import json
+import os
+import sys
+import pandas as pd
 import pytest
 from datetime import date
+from types import SimpleNamespace
 
-from happytube.models.markdown import MarkdownFile
+from happytube.models.markdown import MarkdownFile, list_video_files
 from happytube.models.video import Video
-from happytube.config.settings import Settings
+from happytube.cli.commands import (
+    count_stage_videos,
+    load_youtube_config,
+    parse_date,
+    run_pipeline,
+)
+from happytube.config.config_manager import ConfigManager
+from happytube.config.settings import Settings, get_settings
+from happytube.stages.assess import AssessStage
 from happytube.stages.base import Stage
+from happytube.stages.enhance import EnhanceStage
 from happytube.stages.fetch import FetchStage
+from happytube.stages.report import REPORT_FIELDS, ReportStage
+from happytube.web import server
+from happytube.web.export import (
+    export_to_static,
+    iter_json_items,
+    load_videos_from_data_dir,
+)
 
 
 class TestMarkdownFile:
@@ -57,6 +81,74 @@ A cute cat video that makes everyone smile."""
         assert md_file.frontmatter["happiness_score"] == 4
         assert "cute cat video" in md_file.content
 
+    def test_load_keeps_rules_in_content(self, tmp_path):
+        """Test that only the first closing marker ends the frontmatter."""
+        test_file = tmp_path / "video.md"
+        test_file.write_text("---\nvideo_id: a\n---\n\nabove\n---\nbelow\n")
+
+        md_file = MarkdownFile.load(test_file)
+
+        assert md_file.frontmatter == {"video_id": "a"}
+        assert md_file.content == "above\n---\nbelow"
+
+    def test_list_video_files(self, tmp_path):
+        """Test listing video files in a stage directory."""
+        assert list_video_files(tmp_path / "missing") == []
+
+        for name in ["video_b.md", "video_a.md", "notes.md", "video_c.json"]:
+            (tmp_path / name).touch()
+        (tmp_path / "video_dir.md").mkdir()
+
+        assert list_video_files(tmp_path) == [
+            tmp_path / "video_a.md",
+            tmp_path / "video_b.md",
+        ]
+
+    def test_save_after_adding_keys(self, tmp_path):
+        """Test that keys added or changed after loading round-trip."""
+        path = tmp_path / "video.md"
+        MarkdownFile({"video_id": "a", "title": "Cat: the movie"}, "# Cat").save(path)
+
+        md_file = MarkdownFile.load(path)
+        md_file.update_frontmatter(
+            {"happiness_score": 4, "happiness_reasoning": 'Says "hi"\nž', "x": None}
+        )
+        md_file.save(path)
+        reloaded = MarkdownFile.load(path)
+
+        assert reloaded.frontmatter == md_file.frontmatter
+        assert reloaded.content == "# Cat"
+
+        reloaded.update_frontmatter({"title": "Dog", "tags": ["a"]})
+        reloaded.save(path)
+        assert MarkdownFile.load(path).frontmatter["title"] == "Dog"
+
+    def test_load_scalar_fast_matches_yaml(self, tmp_path):
+        """Test that the regex frontmatter parser agrees with the YAML loader."""
+        frontmatter = {
+            "video_id": "abc",
+            "title": 'It\'s: a "cat" # 1',
+            "happiness_score": 4,
+            "happiness_reasoning": None,
+            "fetched_at": "2025-11-16T10:00:00Z",
+            "channel": "yes",
+            "duration": "0123",
+            "description": "Příliš žluťoučký kůň",
+            "tags": ["a", "b"],
+        }
+        path = tmp_path / "video.md"
+        MarkdownFile(frontmatter, "# Cat\n\nText").save(path)
+        flat = {k: v for k, v in frontmatter.items() if k != "tags"}
+        flat_path = tmp_path / "flat.md"
+        MarkdownFile(flat, "# Cat").save(flat_path)
+
+        for md_path in [path, flat_path]:
+            loaded = MarkdownFile.load(md_path)
+            assert MarkdownFile.load_scalar_fast(md_path) == (
+                loaded.frontmatter,
+                loaded.content,
+            )
+
     def test_update_frontmatter(self, tmp_path):
         """Test updating frontmatter."""
         frontmatter = {"video_id": "test123", "stage": "fetched"}
@@ -122,6 +214,53 @@ class TestSettings:
         with pytest.raises(Exception):  # Should raise validation error
             Settings()
 
+    def test_get_settings_is_cached(self, monkeypatch):
+        """Test that settings are only parsed once per process."""
+        monkeypatch.setenv("YTKEY", "test_key")
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test_key")
+        get_settings.cache_clear()
+
+        try:
+            assert get_settings() is get_settings()
+        finally:
+            get_settings.cache_clear()
+
+
+class TestConfigManager:
+    """Test ConfigManager loading."""
+
+    def test_load_all_skips_loaded_configs(self, tmp_path):
+        """Test that already loaded configs are not re-read from disk."""
+        (tmp_path / "app.yaml").write_text("version: 1\n")
+        manager = ConfigManager(base_path=tmp_path)
+        manager.load_all_base_configs()
+
+        (tmp_path / "app.yaml").write_text("version: 2\n")
+        manager.load_all_base_configs()
+
+        assert manager.get_config("app") == {"version": 1}
+
+    def test_load_config_picks_up_edits(self, tmp_path):
+        """Test that memoized YAML is invalidated when the file changes."""
+        config_path = tmp_path / "app.yaml"
+        config_path.write_text("version: 1\n")
+        manager = ConfigManager(base_path=tmp_path)
+        assert manager.load_config("app") == {"version": 1}
+
+        config_path.write_text("version: 2\n")
+        os.utime(config_path, ns=(0, config_path.stat().st_mtime_ns + 1))
+        assert manager.load_config("app") == {"version": 2}
+
+    def test_missing_config(self, tmp_path):
+        """Test that a missing config file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            ConfigManager(base_path=tmp_path).load_config("app")
+
+    def test_load_youtube_config(self):
+        """Test looking up search params through the shared manager."""
+        assert isinstance(load_youtube_config("Music"), dict)
+        assert load_youtube_config("NoSuchCategory") is None
+
 
 class TestVideoModel:
     """Test Video model functionality."""
@@ -159,6 +298,90 @@ class TestVideoModel:
         assert data_dict["happiness_score"] == 4
         assert "title" in data_dict
 
+    def test_df_from_stage_dir(self, tmp_path, monkeypatch):
+        """Test loading a stage directory into a DataFrame."""
+        monkeypatch.chdir(tmp_path)
+        stage_dir = tmp_path / "stages" / "fetch" / date.today().strftime("%Y-%m-%d")
+        stage_dir.mkdir(parents=True)
+        for video_id in ["a", "b"]:
+            frontmatter = {
+                "video_id": video_id,
+                "title": f"Video {video_id}",
+                "channel": "Test Channel",
+                "fetched_at": "2025-11-16T10:00:00Z",
+                "stage": "fetched",
+                "prompt_version": 2,
+            }
+            MarkdownFile(frontmatter, "# Video").save(
+                stage_dir / f"video_{video_id}.md"
+            )
+        (stage_dir / "video_broken.md").write_text("---\ntitle: [unclosed\n---\n")
+
+        df = Video.df_from_stage_dir("fetch", days_back=1)
+
+        assert sorted(df["video_id"]) == ["a", "b"]
+        assert list(df.columns) == list(Video.model_fields)
+        assert pd.api.types.is_datetime64_any_dtype(df["fetched_at"])
+        Video.to_parquet(df, tmp_path / "fetch.parquet")
+        empty = Video.df_from_stage_dir("assess")
+        assert empty.empty
+        assert list(empty.columns) == list(Video.model_fields)
+
+    def test_df_from_date_dir_with_mixed_types(self, tmp_path):
+        """Test that values of the wrong type do not break loading a date."""
+        for video_id, duration, title in [("a", 120, "Cats"), ("b", "2:00", 123)]:
+            frontmatter = {"video_id": video_id, "duration": duration, "title": title}
+            MarkdownFile(frontmatter, "").save(tmp_path / f"video_{video_id}.md")
+
+        df = Video.df_from_date_dir(tmp_path)
+
+        assert df["duration"].tolist()[0] == 120
+        assert pd.isna(df["duration"].tolist()[1])
+        assert df["title"].tolist() == ["Cats", 123]
+
+    def test_df_from_stage_dir_snapshot(self, tmp_path, monkeypatch):
+        """Test that the per-date Parquet snapshot is reused until files change."""
+        monkeypatch.chdir(tmp_path)
+        stage_dir = tmp_path / "stages" / "fetch" / date.today().strftime("%Y-%m-%d")
+        stage_dir.mkdir(parents=True)
+
+        def save_video(video_id):
+            frontmatter = {
+                "video_id": video_id,
+                "title": f"Video {video_id}",
+                "channel": "Test Channel",
+                "fetched_at": "2025-11-16T10:00:00Z",
+                "stage": "fetched",
+            }
+            MarkdownFile(frontmatter, "# Video").save(
+                stage_dir / f"video_{video_id}.md"
+            )
+
+        save_video("a")
+        Video.df_from_stage_dir("fetch", days_back=1)
+        snapshot = stage_dir / "_videos.parquet"
+        assert snapshot.exists()
+
+        # a snapshot newer than every file is read instead of the markdown
+        df = pd.DataFrame({"video_id": ["from-snapshot"]})
+        df.to_parquet(snapshot)
+        assert list(Video.df_from_stage_dir("fetch", days_back=1)["video_id"]) == [
+            "from-snapshot"
+        ]
+
+        os.utime(snapshot, ns=(0, 0))
+        save_video("b")
+        df = Video.df_from_stage_dir("fetch", days_back=1)
+        assert sorted(df["video_id"]) == ["a", "b"]
+
+        # an unchanged directory is served from memory after that
+        def fail(*args, **kwargs):
+            raise AssertionError("snapshot read again")
+
+        monkeypatch.setattr(pd, "read_parquet", fail)
+        df = Video.df_from_stage_dir("fetch", days_back=1)
+        assert sorted(df["video_id"]) == ["a", "b"]
+
 
 class TestStageBase:
     """Test Stage base class functionality."""
@@ -220,6 +443,611 @@ class TestFetchStageIntegration:
         expected_suffix = "stages/fetch/2025-11-16"
         assert str(stage_dir).endswith(expected_suffix)
 
+    def test_fetch_saves_at_most_max_videos(self, tmp_path, monkeypatch):
+        """Test that fetched rows are written as markdown, up to max_videos."""
+        monkeypatch.chdir(tmp_path)
+
+        class FakeSearch:
+            def set_param(self, key, value):
+                pass
+
+            def get(self):
+                pass
+
+            def get_df(self):
+                return pd.DataFrame(
+                    {
+                        "video_id": ["a", "b", "c"],
+                        "title": ["A", "B", "C"],
+                        "description": ["about a", "about b", "about c"],
+                        "channel_title": ["Chan"] * 3,
+                    }
+                )
+
+        monkeypatch.setattr("happytube.stages.fetch.Search", FakeSearch)
+        stage = FetchStage(max_videos=2)
+        result = asyncio.run(stage.run(date(2025, 11, 16)))
+
+        assert result["new_videos"] == 2
+        stage_dir = tmp_path / "stages" / "fetch" / "2025-11-16"
+        md_file = MarkdownFile.load(stage_dir / "video_a.md")
+        assert md_file.frontmatter["channel"] == "Chan"
+        assert md_file.content == "# A\n\nabout a"
+        assert not (stage_dir / "video_c.md").exists()
+
+
+class FakeAsyncClient:
+    """Stand-in for AsyncAnthropic that tracks request concurrency."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+        self.messages = SimpleNamespace(create=self.create)
+
+    async def create(self, model, messages, max_tokens):
+        self.calls += 1
+        self.prompts.append(messages[0]["content"][0]["text"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return SimpleNamespace(content=[SimpleNamespace(text="Enhanced")])
+
+    async def close(self):
+        self.closed = True
+
+
+class TestEnhanceStage:
+    """Test EnhanceStage with a fake Claude client."""
+
+    def test_enhances_concurrently(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        assess_dir = tmp_path / "stages" / "assess" / "2025-11-16"
+        assess_dir.mkdir(parents=True)
+        for i in range(5):
+            frontmatter = {
+                "video_id": f"v{i}",
+                "title": f"Video {i}",
+                "happiness_score": 4,
+            }
+            MarkdownFile(frontmatter, f"# Video {i}\n\nOriginal").save(
+                assess_dir / f"video_v{i}.md"
+            )
+
+        client = FakeAsyncClient()
+        # a client the stage creates itself is closed after the run
+        monkeypatch.setattr(
+            "happytube.stages.enhance.create_async_client", lambda: client
+        )
+        stage = EnhanceStage(max_concurrency=2)
+        result = asyncio.run(stage.run(date(2025, 11, 16)))
+
+        assert result["enhanced_videos"] == 5
+        assert result["errors"] == 0
+        assert client.max_in_flight == 2
+        assert client.closed
+        enhanced = MarkdownFile.load(
+            tmp_path / "stages" / "enhance" / "2025-11-16" / "video_v0.md"
+        )
+        assert enhanced.frontmatter["enhanced_description"] == "Enhanced"
+
+    def test_missing_api_key_fails_the_run(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        monkeypatch.setattr("happytube.claude.load_env", lambda: None)
+        assess_dir = tmp_path / "stages" / "assess" / "2025-11-16"
+        assess_dir.mkdir(parents=True)
+        MarkdownFile({"video_id": "a", "happiness_score": 5}, "").save(
+            assess_dir / "video_a.md"
+        )
+
+        result = asyncio.run(EnhanceStage().run(date(2025, 11, 16)))
+
+        assert result["enhanced_videos"] == 0
+        assert result["errors"] == 1
+        assert "ANTHROPIC_API_KEY" in result["error_message"]
+
+    def test_load_skips_unhappy_and_broken_files(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        assess_dir = tmp_path / "stages" / "assess" / "2025-11-16"
+        assess_dir.mkdir(parents=True)
+        for video_id, score in [("a", 5), ("b", 1), ("c", 3)]:
+            frontmatter = {"video_id": video_id, "happiness_score": score}
+            MarkdownFile(frontmatter, "").save(assess_dir / f"video_{video_id}.md")
+        (assess_dir / "video_broken.md").write_text("---\ntitle: [oops\n---\n")
+
+        stage = EnhanceStage(happiness_threshold=3)
+        videos = asyncio.run(stage._load_videos_from_assess(date(2025, 11, 16)))
+
+        assert [v.frontmatter["video_id"] for v in videos] == ["a", "c"]
+
+    def test_duplicate_descriptions_share_one_request(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        assess_dir = tmp_path / "stages" / "assess" / "2025-11-16"
+        assess_dir.mkdir(parents=True)
+        for i in range(4):
+            frontmatter = {
+                "video_id": f"v{i}",
+                "title": "Trailer",
+                "happiness_score": 4,
+            }
+            MarkdownFile(frontmatter, "# Trailer\n\nSubscribe!").save(
+                assess_dir / f"video_v{i}.md"
+            )
+
+        client = FakeAsyncClient()
+        stage = EnhanceStage(client=client)
+        result = asyncio.run(stage.run(date(2025, 11, 16)))
+
+        assert client.calls == 1
+        assert result["enhanced_videos"] == 4
+        # the caller owns an injected client
+        assert not client.closed
+
+    def test_prompt_input_is_trimmed(self):
+        client = FakeAsyncClient()
+        stage = EnhanceStage(max_input_chars=20, client=client)
+        description = "Cats!\n\nhttps://spam.example/x\n\n" + "meow " * 100
+
+        enhanced = asyncio.run(stage._enhance_description_simple("Cats", description))
+
+        assert enhanced == "Enhanced"
+        assert "Description: Cats!\n\nmeow meow meo\n" in client.prompts[0]
+        assert "spam.example" not in client.prompts[0]
+
+
+class FakeAsyncBatches:
+    """Stand-in for AsyncAnthropic.messages.batches."""
+
+    def __init__(self):
+        self.created = None
+
+    async def create(self, requests):
+        self.created = requests
+        return SimpleNamespace(id="batch_1", processing_status="in_progress")
+
+    async def retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, processing_status="ended")
+
+    async def results(self, batch_id):
+        async def entries():
+            for request in self.created:
+                video_id = request["custom_id"]
+                if video_id == "v1":
+                    result = SimpleNamespace(type="errored")
+                else:
+                    message = SimpleNamespace(
+                        content=[SimpleNamespace(text=f" Enhanced {video_id} ")]
+                    )
+                    result = SimpleNamespace(type="succeeded", message=message)
+                yield SimpleNamespace(custom_id=video_id, result=result)
+
+        return entries()
+
+
+class TestEnhanceStageBatch:
+    """Test EnhanceStage with the Message Batches API."""
+
+    def test_batch_enhances_all_videos(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        assess_dir = tmp_path / "stages" / "assess" / "2025-11-16"
+        assess_dir.mkdir(parents=True)
+        for i in range(3):
+            frontmatter = {"video_id": f"v{i}", "title": f"V{i}", "happiness_score": 4}
+            MarkdownFile(frontmatter, f"# V{i}\n\nOriginal {i}").save(
+                assess_dir / f"video_v{i}.md"
+            )
+
+        client = FakeAsyncClient()
+        client.messages.batches = FakeAsyncBatches()
+        stage = EnhanceStage(batch=True, poll_interval=0, client=client)
+        result = asyncio.run(stage.run(date(2025, 11, 16)))
+
+        assert [r["custom_id"] for r in client.messages.batches.created] == [
+            "v0",
+            "v1",
+            "v2",
+        ]
+        assert result["enhanced_videos"] == 3
+        enhance_dir = tmp_path / "stages" / "enhance" / "2025-11-16"
+        v0 = MarkdownFile.load(enhance_dir / "video_v0.md")
+        v1 = MarkdownFile.load(enhance_dir / "video_v1.md")
+        assert v0.frontmatter["enhanced_description"] == "Enhanced v0"
+        assert v1.frontmatter["enhanced_description"] == "Original 1"
+
+
+class FakeChunkClient:
+    """Stand-in for AsyncAnthropic that rates every video in a request as 4."""
+
+    def __init__(self):
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.messages = SimpleNamespace(create=self.create)
+
+    async def create(self, model, messages, max_tokens):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        rows = list(csv.DictReader(io.StringIO(messages[0]["content"][1]["text"])))
+        text = "id,happiness\n" + "".join(f"{row['video_id']},4\n" for row in rows)
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+class FakeChunkBatches:
+    """Stand-in for AsyncAnthropic.messages.batches rating every video as 4."""
+
+    def __init__(self):
+        self.created = None
+
+    async def create(self, requests):
+        self.created = requests
+        return SimpleNamespace(id="batch_1", processing_status="in_progress")
+
+    async def retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, processing_status="ended")
+
+    async def results(self, batch_id):
+        async def entries():
+            for request in self.created:
+                custom_id = request["custom_id"]
+                if custom_id == "chunk-1":
+                    result = SimpleNamespace(type="errored")
+                else:
+                    content = request["params"]["messages"][0]["content"]
+                    rows = csv.DictReader(io.StringIO(content[1]["text"]))
+                    text = "id,happiness\n" + "".join(
+                        f"{row['video_id']},4\n" for row in rows
+                    )
+                    message = SimpleNamespace(content=[SimpleNamespace(text=text)])
+                    result = SimpleNamespace(type="succeeded", message=message)
+                yield SimpleNamespace(custom_id=custom_id, result=result)
+
+        return entries()
+
+
+class TestAssessStage:
+    """Test AssessStage with a fake Claude client."""
+
+    def test_videos_are_rated_in_chunks(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        fetch_dir = tmp_path / "stages" / "fetch" / "2025-11-16"
+        fetch_dir.mkdir(parents=True)
+        for i in range(5):
+            MarkdownFile(
+                {"video_id": f"v{i}", "title": f"Video {i}"},
+                f"# Video {i}\n\nDescription",
+            ).save(fetch_dir / f"video_v{i}.md")
+
+        client = FakeChunkClient()
+        stage = AssessStage(client=client, chunk_size=2, max_concurrency=2)
+        result = asyncio.run(stage.run(date(2025, 11, 16)))
+
+        assert client.calls == 3
+        assert client.max_in_flight == 2
+        assert result["assessed_videos"] == 5
+        assert result["avg_happiness"] == 4
+        assessed = MarkdownFile.load(
+            tmp_path / "stages" / "assess" / "2025-11-16" / "video_v4.md"
+        )
+        assert assessed.frontmatter["happiness_score"] == 4
+
+    def test_failed_chunk_keeps_the_other_answers(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        fetch_dir = tmp_path / "stages" / "fetch" / "2025-11-16"
+        fetch_dir.mkdir(parents=True)
+        for i in range(4):
+            MarkdownFile(
+                {"video_id": f"v{i}", "title": f"Video {i}"},
+                f"# Video {i}\n\nDescription",
+            ).save(fetch_dir / f"video_v{i}.md")
+
+        client = FakeChunkClient()
+        create = client.create
+
+        async def fail_second_chunk(model, messages, max_tokens):
+            if "v2" in messages[0]["content"][1]["text"]:
+                raise RuntimeError("overloaded")
+            return await create(model, messages, max_tokens)
+
+        client.messages.create = fail_second_chunk
+        stage = AssessStage(client=client, chunk_size=2)
+        result = asyncio.run(stage.run(date(2025, 11, 16)))
+
+        assert result["assessed_videos"] == 2
+        assert result["errors"] == 1
+        assess_dir = tmp_path / "stages" / "assess" / "2025-11-16"
+        assert sorted(p.name for p in assess_dir.glob("video_*.md")) == [
+            "video_v0.md",
+            "video_v1.md",
+        ]
+
+    def test_batch_rates_all_chunks_in_one_batch(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        fetch_dir = tmp_path / "stages" / "fetch" / "2025-11-16"
+        fetch_dir.mkdir(parents=True)
+        for i in range(5):
+            MarkdownFile(
+                {"video_id": f"v{i}", "title": f"Video {i}"},
+                f"# Video {i}\n\nDescription",
+            ).save(fetch_dir / f"video_v{i}.md")
+
+        client = FakeChunkClient()
+        client.messages.batches = FakeChunkBatches()
+        stage = AssessStage(client=client, chunk_size=2, batch=True, poll_interval=0)
+        result = asyncio.run(stage.run(date(2025, 11, 16)))
+
+        assert client.calls == 0
+        assert [r["custom_id"] for r in client.messages.batches.created] == [
+            "chunk-0",
+            "chunk-1",
+            "chunk-2",
+        ]
+        # the failed request's chunk is left for the next run
+        assert result["assessed_videos"] == 3
+        assert result["errors"] == 1
+
+    def test_parse_claude_response(self):
+        stage = AssessStage()
+
+        results = stage._parse_claude_response(
+            'id,happiness,reasoning\n0123,4,"calm, sunny"\nb,n/a,\nc,5\n'
+        )
+
+        assert results["0123"] == {
+            "happiness_score": 4,
+            "happiness_reasoning": "calm, sunny",
+        }
+        assert results["b"]["happiness_score"] == 0
+        assert stage._parse_claude_response("") == {}
+
+
+class TestRunPipeline:
+    """Test how run_pipeline wires the stages together."""
+
+    def test_assess_and_enhance_share_one_client(self, monkeypatch):
+        class FakeClient:
+            closed = 0
+
+            async def close(self):
+                self.closed += 1
+
+        client = FakeClient()
+        monkeypatch.setattr("happytube.claude.create_async_client", lambda: client)
+        used = {}
+
+        def fake_run(result):
+            async def run(self, target_date):
+                used[self.stage_name] = getattr(self, "client", None)
+                return result
+
+            return run
+
+        monkeypatch.setattr(FetchStage, "run", fake_run({"new_videos": 1}))
+        monkeypatch.setattr(
+            AssessStage, "run", fake_run({"assessed_videos": 1, "avg_happiness": 4})
+        )
+        monkeypatch.setattr(EnhanceStage, "run", fake_run({"enhanced_videos": 1}))
+        monkeypatch.setattr(ReportStage, "run", fake_run({"videos_reported": 1}))
+        monkeypatch.setattr(
+            "happytube.cli.commands.load_youtube_config", lambda category: {}
+        )
+
+        results = asyncio.run(run_pipeline("music", 10, 3, date(2025, 11, 16)))
+
+        assert set(results) == {"fetch", "assess", "enhance", "report"}
+        assert used["assess"] is client
+        assert used["enhance"] is client
+        assert client.closed == 1
+
+
+class TestReportStage:
+    """Test loading enhanced videos for the report."""
+
+    def test_load_enhanced_videos(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        enhance_dir = tmp_path / "stages" / "enhance" / "2025-11-16"
+        enhance_dir.mkdir(parents=True)
+        for video_id, score in [("a", 3), ("b", 5), ("c", 4), ("d", None)]:
+            frontmatter = {
+                "video_id": video_id,
+                "title": f"Video {video_id}",
+                "happiness_score": score,
+            }
+            MarkdownFile(frontmatter, "").save(enhance_dir / f"video_{video_id}.md")
+
+        stage = ReportStage(template_dir=tmp_path / "templates")
+        videos = asyncio.run(stage._load_enhanced_videos(date(2025, 11, 16)))
+
+        assert [v["video_id"] for v in videos] == ["b", "c", "a", "d"]
+        assert [v["happiness_score"] for v in videos] == [5, 4, 3, None]
+        assert type(videos[0]["happiness_score"]) is int
+        assert videos[0]["happiness_reasoning"] is None
+        assert list(videos[0]) == REPORT_FIELDS
+        assert (enhance_dir / "_videos.parquet").exists()
+
+
+class TestWebExport:
+    """Test loading fetched YouTube JSON for the web export."""
+
+    def test_load_videos_from_data_dir(self, tmp_path):
+        item = {"id": {"videoId": "a"}, "snippet": {"title": "Cats"}}
+        (tmp_path / "search").mkdir()
+        (tmp_path / "search" / "1.json").write_text(json.dumps([item]))
+        (tmp_path / "search" / "2.json").write_text(json.dumps([item, {"id": "b"}]))
+        (tmp_path / "broken.json").write_text("[{")
+
+        videos = load_videos_from_data_dir(tmp_path)
+
+        assert sorted(v.video_id for v in videos) == ["a", "b"]
+        assert next(v for v in videos if v.video_id == "a").title == "Cats"
+
+    def test_large_arrays_are_streamed(self, tmp_path, monkeypatch):
+        pytest.importorskip("ijson")
+        monkeypatch.setattr("happytube.web.export.STREAM_MIN_BYTES", 0)
+        items = [{"id": {"videoId": v}, "snippet": {"title": "Kůň"}} for v in "ab"]
+        (tmp_path / "1.json").write_text(json.dumps(items))
+        (tmp_path / "2.json").write_text(json.dumps({"id": "c"}))
+
+        videos = load_videos_from_data_dir(tmp_path)
+
+        assert sorted(v.video_id for v in videos) == ["a", "b", "c"]
+
+    def test_unchanged_files_are_read_from_the_index(self, tmp_path, monkeypatch):
+        data_dir = tmp_path / "fetched"
+        data_dir.mkdir()
+        index = tmp_path / "videos.index.json"
+        (data_dir / "1.json").write_text(json.dumps([{"id": "a"}]))
+        (data_dir / "2.json").write_text(json.dumps([{"id": "b"}]))
+        load_videos_from_data_dir(data_dir, index)
+
+        (data_dir / "2.json").write_text(json.dumps([{"id": "c"}, {"id": "d"}]))
+        parsed = []
+        monkeypatch.setattr(
+            "happytube.web.export.iter_json_items",
+            lambda path: parsed.append(path) or iter_json_items(path),
+        )
+        videos = load_videos_from_data_dir(data_dir, index)
+
+        assert sorted(v.video_id for v in videos) == ["a", "c", "d"]
+        assert parsed == [str(data_dir / "2.json")]
+        assert set(json.loads(index.read_text())) == {"1.json", "2.json"}
+
+    def test_export_to_static_writes_a_json_array(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        data_dir = tmp_path / "fetched"
+        data_dir.mkdir()
+        items = [{"id": {"videoId": v}, "snippet": {"title": "Kůň"}} for v in "ab"]
+        (data_dir / "1.json").write_text(json.dumps(items))
+        output = tmp_path / "static" / "videos.json"
+
+        export_to_static(output, data_dir, columnar=False)
+        export_to_static(tmp_path / "empty.json", tmp_path / "missing", columnar=False)
+
+        videos = json.loads(output.read_text(encoding="utf-8"))
+        assert [v["video_id"] for v in videos] == ["a", "b"]
+        assert videos[0]["title"] == "Kůň"
+        assert json.loads((tmp_path / "empty.json").read_text()) == []
+        # the index stays out of the published directory
+        assert (tmp_path / ".cache" / "export" / "videos.index.json").exists()
+        assert [p.name for p in output.parent.iterdir()] == ["videos.json"]
+
+    def test_export_to_static_writes_columns(self, tmp_path):
+        items = [
+            {"id": {"videoId": v}, "snippet": {"title": t}} for v, t in ["aA", "bB"]
+        ]
+        (tmp_path / "1.json").write_text(json.dumps(items))
+        output = tmp_path / "videos.json"
+
+        index = tmp_path / "cache" / "videos.index.json"
+        export_to_static(output, tmp_path, index_path=index)
+        export_to_static(tmp_path / "empty.json", tmp_path / "missing", index_path=None)
+
+        columns = json.loads(output.read_text(encoding="utf-8"))
+        assert columns["video_id"] == ["a", "b"]
+        assert columns["title"] == ["A", "B"]
+        assert columns["thumbnail"] == ["", ""]
+        assert json.loads((tmp_path / "empty.json").read_text())["video_id"] == []
+        assert set(json.loads(index.read_text())) == {"1.json"}
+
+
+class TestWebServer:
+    """Test the Flask server's video loading and caching."""
+
+    @pytest.fixture
+    def paths(self, tmp_path, monkeypatch):
+        data_dir = tmp_path / "fetched"
+        data_dir.mkdir()
+        exported = tmp_path / "videos.json"
+        monkeypatch.setattr(server, "DATA_DIR", data_dir)
+        monkeypatch.setattr(server, "EXPORTED_VIDEOS", exported)
+        monkeypatch.setattr(server, "_cache", None)
+        return data_dir, exported
+
+    def test_loads_fetched_files_once(self, paths):
+        data_dir, _ = paths
+        (data_dir / "1.json").write_text(json.dumps([{"id": "a"}, {"id": "b"}]))
+        (data_dir / "2.json").write_text(json.dumps([{"id": "a"}]))
+
+        videos = server.load_video_data()
+
+        assert sorted(v["video_id"] for v in videos) == ["a", "b"]
+        assert server.load_video_data() is videos
+        assert server.find_video("b")["video_id"] == "b"
+        assert server.find_video("missing") is None
+
+    def test_cache_is_invalidated_by_new_files(self, paths):
+        data_dir, _ = paths
+        (data_dir / "1.json").write_text(json.dumps([{"id": "a"}]))
+        first = server.load_video_data()
+
+        (data_dir / "sub").mkdir()
+        (data_dir / "sub" / "2.json").write_text(json.dumps([{"id": "b"}]))
+        second = server.load_video_data()
+
+        assert second is not first
+        assert sorted(v["video_id"] for v in second) == ["a", "b"]
+
+    def test_current_export_is_read_instead(self, paths):
+        data_dir, exported = paths
+        shard = data_dir / "1.json"
+        shard.write_text(json.dumps([{"id": "a"}]))
+        exported.write_text(json.dumps({"video_id": ["x", "y"], "title": ["X", "Y"]}))
+        os.utime(shard, ns=(1, 1))
+
+        videos = server.load_video_data()
+
+        assert videos == [
+            {"video_id": "x", "title": "X"},
+            {"video_id": "y", "title": "Y"},
+        ]
+        assert server.find_video("y")["title"] == "Y"
+
+    def test_stale_or_empty_export_is_ignored(self, paths):
+        data_dir, exported = paths
+        shard = data_dir / "1.json"
+        shard.write_text(json.dumps([{"id": "a"}]))
+        exported.write_text(json.dumps([{"video_id": "x"}]))
+        os.utime(exported, ns=(1, 1))
+        assert [v["video_id"] for v in server.load_video_data()] == ["a"]
+
+        exported.write_text("[]")
+        assert [v["video_id"] for v in server.load_video_data()] == ["a"]
+
+    def test_api_returns_404_for_unknown_video(self, paths):
+        data_dir, _ = paths
+        (data_dir / "1.json").write_text(json.dumps([{"id": "a"}]))
+        client = server.app.test_client()
+
+        assert client.get("/api/videos/a").get_json()["video_id"] == "a"
+        assert client.get("/api/videos/b").status_code == 404
+
+    def test_run_server_without_debug_warms_the_cache(self, paths, monkeypatch):
+        monkeypatch.setitem(sys.modules, "waitress", None)
+        calls = []
+        monkeypatch.setattr(server.app, "run", lambda **kwargs: calls.append(kwargs))
+
+        server.run_server(debug=False)
+
+        assert server._cache is not None
+        assert calls == [
+            {"host": "127.0.0.1", "port": 5000, "debug": False, "threaded": True}
+        ]
+
+    def test_run_server_serves_with_waitress(self, paths, monkeypatch):
+        calls = []
+        waitress = SimpleNamespace(serve=lambda app, **kwargs: calls.append(kwargs))
+        monkeypatch.setitem(sys.modules, "waitress", waitress)
+
+        server.run_server(debug=False)
+
+        assert calls == [{"host": "127.0.0.1", "port": 5000, "threads": 8}]
+
 
 class TestPipelineDataFlow:
     """Test data flow through the pipeline stages."""
@@ -348,6 +1176,26 @@ Content"""
         with pytest.raises(Exception):  # Should raise YAML parsing error
             MarkdownFile.load(broken_file)
 
+    def test_parse_date(self):
+        """Test CLI date parsing."""
+        assert parse_date("2025-11-16") == date(2025, 11, 16)
+        assert parse_date(None) == date.today()
+
+        with pytest.raises(SystemExit):
+            parse_date("16.11.2025")
+
+    def test_count_stage_videos(self, tmp_path):
+        """Test counting video files for the status command."""
+        stage_dir = tmp_path / "fetch" / "2025-11-16"
+        assert count_stage_videos(stage_dir) is None
+
+        stage_dir.mkdir(parents=True)
+        (stage_dir / "video_a.md").touch()
+        (stage_dir / "video_b.md").touch()
+        (stage_dir / "notes.md").touch()
+        (stage_dir / "video_c.json").touch()
+        assert count_stage_videos(stage_dir) == 2
+
     def test_stage_with_empty_directory(self, tmp_path):
         """Test stage behavior with empty source directory."""
         # Create empty fetch directory
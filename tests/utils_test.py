@@ -36,3 +36,4 @@ def test_determine_text_script(text, expected):
     result = determine_text_script(text)
     # pytest.fail(f"{result=}, {expected=}")
     assert result == expected
+